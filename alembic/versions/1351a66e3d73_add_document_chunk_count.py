@@ -0,0 +1,42 @@
+"""add documents.chunk_count
+
+Revision ID: 1351a66e3d73
+Revises: 5ca194bf3807
+Create Date: 2026-10-15 09:20:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1351a66e3d73"
+down_revision = "5ca194bf3807"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE documents "
+        "ADD COLUMN IF NOT EXISTS chunk_count INTEGER DEFAULT 0"
+    )
+
+    # 기존 문서의 청크 수를 한 번의 집계로 채움
+    op.execute(
+        """
+        UPDATE documents AS d
+        SET chunk_count = c.chunk_count
+        FROM (
+            SELECT document_id, count(*) AS chunk_count
+            FROM document_chunks
+            GROUP BY document_id
+        ) AS c
+        WHERE c.document_id = d.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS chunk_count")
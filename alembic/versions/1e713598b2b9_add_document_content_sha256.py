@@ -0,0 +1,42 @@
+"""add documents.content_sha256 with unique index
+
+Revision ID: 1e713598b2b9
+Revises: 1351a66e3d73
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1e713598b2b9"
+down_revision = "1351a66e3d73"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 기존 문서는 해시 없이(NULL) 유지 - NULL은 유니크 제약에 걸리지 않음
+    op.execute(
+        "ALTER TABLE documents "
+        "ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64)"
+    )
+
+    # 운영 중인 테이블을 잠그지 않도록 CONCURRENTLY로 인덱스 생성
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS
+                ix_documents_content_sha256 ON documents (content_sha256)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_documents_content_sha256"
+        )
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS content_sha256")
@@ -0,0 +1,69 @@
+"""add document_chunks.document_id foreign key with ON DELETE CASCADE
+
+Revision ID: 22534c36870b
+Revises: 63c44e62ae78
+Create Date: 2026-10-15 09:50:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "22534c36870b"
+down_revision = "63c44e62ae78"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CASCADE 삭제와 문서별 청크 조회에 쓰이는 인덱스
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS
+                ix_document_chunks_document_id
+                ON document_chunks (document_id)
+            """
+        )
+
+    # 문서 없이 남아 있는 청크는 외래 키를 추가할 수 없으므로 먼저 정리
+    op.execute(
+        """
+        DELETE FROM document_chunks AS c
+        WHERE NOT EXISTS (
+            SELECT 1 FROM documents AS d WHERE d.id = c.document_id
+        )
+        """
+    )
+
+    # 기존 행 검증은 NOT VALID 추가 후 별도 트랜잭션에서 수행 (쓰기 잠금 최소화)
+    op.execute(
+        "ALTER TABLE document_chunks "
+        "DROP CONSTRAINT IF EXISTS document_chunks_document_id_fkey"
+    )
+    op.execute(
+        """
+        ALTER TABLE document_chunks
+            ADD CONSTRAINT document_chunks_document_id_fkey
+            FOREIGN KEY (document_id) REFERENCES documents (id)
+            ON DELETE CASCADE NOT VALID
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE document_chunks "
+            "VALIDATE CONSTRAINT document_chunks_document_id_fkey"
+        )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE document_chunks "
+        "DROP CONSTRAINT IF EXISTS document_chunks_document_id_fkey"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_document_id"
+        )
@@ -0,0 +1,104 @@
+"""add documents.object_name with unique index
+
+Revision ID: 5ca194bf3807
+Revises: 84d2b5964af6
+Create Date: 2026-10-15 09:10:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5ca194bf3807"
+down_revision = "84d2b5964af6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS object_name VARCHAR(500)"
+    )
+
+    # 기존 문서는 file_path(minio://bucket/key)에서 버킷 접두사만 제거해
+    # 하위 경로를 포함한 전체 object key를 채움
+    op.execute(
+        """
+        UPDATE documents
+        SET object_name = regexp_replace(file_path, '^minio://[^/]+/', '')
+        WHERE object_name IS NULL
+        """
+    )
+    op.execute("ALTER TABLE documents ALTER COLUMN object_name SET NOT NULL")
+
+    # 이전의 중복 수집 경쟁으로 같은 object key 문서가 여러 개 있으면
+    # 가장 먼저 생성된 문서만 남기고 나머지는 청크/임베딩과 함께 삭제
+    op.execute(
+        """
+        CREATE TEMP TABLE duplicate_documents ON COMMIT DROP AS
+        SELECT id FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY object_name ORDER BY created_at, id
+            ) AS rn
+            FROM documents
+        ) AS ranked
+        WHERE rn > 1
+        """
+    )
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF to_regclass('langchain_pg_embedding') IS NOT NULL THEN
+                DELETE FROM langchain_pg_embedding
+                WHERE cmetadata->>'document_id' IN (
+                    SELECT id::text FROM duplicate_documents
+                );
+            END IF;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM document_chunks
+        WHERE document_id IN (SELECT id FROM duplicate_documents)
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM documents
+        WHERE id IN (SELECT id FROM duplicate_documents)
+        """
+    )
+
+    # 운영 중인 테이블을 잠그지 않도록 CONCURRENTLY로 인덱스 생성
+    with op.get_context().autocommit_block():
+        # 이전 실행이 실패해 INVALID 상태로 남은 인덱스는 IF NOT EXISTS에
+        # 걸려 건너뛰게 되므로 먼저 삭제
+        is_valid = op.get_bind().scalar(
+            sa.text(
+                """
+                SELECT i.indisvalid
+                FROM pg_index AS i
+                WHERE i.indexrelid = to_regclass('ix_documents_object_name')
+                """
+            )
+        )
+        if is_valid is False:
+            op.execute(
+                "DROP INDEX CONCURRENTLY IF EXISTS ix_documents_object_name"
+            )
+        op.execute(
+            """
+            CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS
+                ix_documents_object_name ON documents (object_name)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_documents_object_name")
+    op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS object_name")
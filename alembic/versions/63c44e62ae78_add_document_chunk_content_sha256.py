@@ -0,0 +1,32 @@
+"""add document_chunks.content_sha256
+
+Revision ID: 63c44e62ae78
+Revises: 1e713598b2b9
+Create Date: 2026-10-15 09:40:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "63c44e62ae78"
+down_revision = "1e713598b2b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 기존 청크는 해시 없이(NULL) 유지 - 새로 처리되는 청크부터 채워짐
+    # (해시 조회는 embedding_cache의 기본 키를 사용하므로 인덱스는 두지 않음)
+    op.execute(
+        "ALTER TABLE document_chunks "
+        "ADD COLUMN IF NOT EXISTS content_sha256 VARCHAR(64)"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE document_chunks DROP COLUMN IF EXISTS content_sha256"
+    )
@@ -0,0 +1,64 @@
+"""initial schema
+
+Revision ID: 84d2b5964af6
+Revises:
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "84d2b5964af6"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # init_db()의 create_all로 이미 생성된 DB에서도 실행할 수 있도록 IF NOT EXISTS 사용
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS documents (
+            id UUID PRIMARY KEY,
+            filename VARCHAR(255) NOT NULL,
+            file_path VARCHAR(500) NOT NULL,
+            file_size INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            processed_at TIMESTAMP WITH TIME ZONE,
+            status VARCHAR(50)
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS document_chunks (
+            id UUID PRIMARY KEY,
+            document_id UUID NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            page_number INTEGER,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            content_hash VARCHAR(64) NOT NULL,
+            model VARCHAR(255) NOT NULL,
+            embedding VECTOR NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT now(),
+            PRIMARY KEY (content_hash, model)
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS embedding_cache")
+    op.execute("DROP TABLE IF EXISTS document_chunks")
+    op.execute("DROP TABLE IF EXISTS documents")
@@ -0,0 +1,76 @@
+"""replace the fp32 HNSW index on langchain_pg_embedding with halfvec
+
+Revision ID: e0e6ee103b4b
+Revises: 22534c36870b
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e0e6ee103b4b"
+down_revision = "22534c36870b"
+branch_labels = None
+depends_on = None
+
+HNSW_INDEX_NAME = "ix_langchain_pg_embedding_hnsw_halfvec"
+LEGACY_HNSW_INDEX_NAME = "ix_langchain_pg_embedding_hnsw"
+
+
+def upgrade() -> None:
+    # 운영 중인 테이블의 쓰기를 막지 않도록 CONCURRENTLY로 인덱스 생성
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+
+        # 임베딩 차원은 PGVector가 만든 vector(N) 컬럼에서 조회
+        # (테이블이 아직 없으면 앱 시작 시 ensure_hnsw_index가 생성)
+        dimension = bind.scalar(
+            sa.text(
+                """
+                SELECT a.atttypmod
+                FROM pg_attribute AS a
+                WHERE a.attrelid = to_regclass('langchain_pg_embedding')
+                    AND a.attname = 'embedding'
+                """
+            )
+        )
+        if dimension is None or dimension <= 0:
+            return
+
+        # 이전 실행이 실패해 INVALID 상태로 남은 인덱스는 먼저 삭제
+        is_valid = bind.scalar(
+            sa.text(
+                """
+                SELECT i.indisvalid
+                FROM pg_index AS i
+                WHERE i.indexrelid = to_regclass(:index_name)
+                """
+            ),
+            {"index_name": HNSW_INDEX_NAME},
+        )
+        if is_valid is False:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}")
+
+        op.execute(
+            f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {HNSW_INDEX_NAME}
+                ON langchain_pg_embedding USING hnsw
+                ((CAST(embedding AS halfvec({int(dimension)})))
+                    halfvec_cosine_ops)
+                WITH (m = 16, ef_construction = 64)
+            """
+        )
+
+        # 새 인덱스가 준비된 뒤 fp32 전체 정밀도 인덱스 삭제
+        # (그 사이에도 검색은 기존 인덱스를 계속 사용)
+        op.execute(
+            f"DROP INDEX CONCURRENTLY IF EXISTS {LEGACY_HNSW_INDEX_NAME}"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {HNSW_INDEX_NAME}")
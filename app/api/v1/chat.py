@@ -2,12 +2,20 @@
 채팅 API 엔드포인트
 """
 
-from typing import Any, Dict, List
+import asyncio
+import logging
+from typing import Any, Dict, Iterator, List
 
+import orjson
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 
+from app.services.embedding import embedding_service
 from app.services.rag import rag_service
+from app.services.semantic_cache import semantic_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -18,10 +26,10 @@ class ChatRequest(BaseModel):
 
 
 class SourceInfo(BaseModel):
-    chunk_id: str
-    document_id: str
-    page_number: int
-    content_preview: str
+    chunk_id: str = ""
+    document_id: str = ""
+    page_number: int = 0
+    content_preview: str = ""
 
 
 class ChatResponse(BaseModel):
@@ -30,6 +38,10 @@ class ChatResponse(BaseModel):
     query: str
 
 
+# RAG 응답의 출처 목록을 한 번에 검증하는 어댑터
+source_list_adapter = TypeAdapter(List[SourceInfo])
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -42,26 +54,85 @@ async def chat(request: ChatRequest):
         if not request.query.strip():
             raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
 
-        # RAG 서비스를 통해 답변 생성
-        result = rag_service.answer_question(request.query, request.k)
+        # 유사한 질문의 캐시된 답변 확인
+        query_embedding = await asyncio.to_thread(
+            embedding_service.embed_query_np, request.query
+        )
+        result = semantic_cache.lookup(query_embedding, request.k)
+
+        if result is None:
+            # RAG 서비스를 통해 답변 생성
+            # (검색과 LLM 호출은 블로킹이므로 스레드에서 실행)
+            # (캐시 조회에 쓴 질의 임베딩을 검색에도 재사용)
+            result = await asyncio.to_thread(
+                rag_service.answer_question,
+                request.query,
+                request.k,
+                query_embedding,
+            )
+
+            # 근거 문서가 있고 생성에 성공한 답변만 캐시
+            if result["sources"] and not result["error"]:
+                semantic_cache.put(query_embedding, request.k, result)
 
         # 응답 모델에 맞게 변환
-        sources = [
-            SourceInfo(
-                chunk_id=source.get("chunk_id", ""),
-                document_id=source.get("document_id", ""),
-                page_number=source.get("page_number", 0),
-                content_preview=source.get("content_preview", ""),
-            )
-            for source in result["sources"]
-        ]
+        sources = source_list_adapter.validate_python(result["sources"])
 
         return ChatResponse(
             answer=result["answer"], sources=sources, query=request.query
         )
 
     except Exception as e:
-        print(f"채팅 API 오류: {e}")
+        logger.error("채팅 API 오류: %s", e)
+        raise HTTPException(
+            status_code=500, detail="내부 서버 오류가 발생했습니다."
+        )
+
+
+def _to_ndjson(events: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    """이벤트를 한 줄에 하나씩 JSON으로 직렬화"""
+    for event in events:
+        yield orjson.dumps(event) + b"\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    RAG 기반 채팅 API (스트리밍)
+
+    답변을 생성되는 대로 NDJSON으로 전송합니다.
+    첫 줄은 `{"sources": [...]}`, 이후 줄은 `{"token": "..."}` 형식입니다.
+
+    - **query**: 질문 내용
+    - **k**: 검색할 관련 문서 수 (기본값: 5)
+    """
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="질문을 입력해주세요.")
+
+    try:
+        query_embedding = await asyncio.to_thread(
+            embedding_service.embed_query_np, request.query
+        )
+        result = semantic_cache.lookup(query_embedding, request.k)
+
+        if result is not None:
+            # 캐시된 답변은 한 번에 전송
+            events = iter(
+                [{"sources": result["sources"]}, {"token": result["answer"]}]
+            )
+        else:
+            # 동기 제너레이터는 StreamingResponse가 스레드 풀에서 순회하며,
+            # 클라이언트 연결이 끊기면 순회를 멈춰 남은 생성을 중단
+            events = rag_service.answer_question_stream(
+                request.query, request.k, query_embedding
+            )
+
+        return StreamingResponse(
+            _to_ndjson(events), media_type="application/x-ndjson"
+        )
+
+    except Exception as e:
+        logger.error("스트리밍 채팅 API 오류: %s", e)
         raise HTTPException(
             status_code=500, detail="내부 서버 오류가 발생했습니다."
         )
@@ -2,7 +2,10 @@
 문서 처리 API 엔드포인트
 """
 
+import asyncio
+import logging
 import os
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
@@ -15,11 +18,13 @@ from fastapi import (
     HTTPException,
     UploadFile,
 )
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.db.database import SessionLocal, get_db
-from app.models.documents import Document, DocumentChunk
+from app.models.documents import Document
 from app.services.cleanup import (
     cleanup_orphaned_data_on_startup,
     get_sync_status,
@@ -28,45 +33,57 @@ from app.services.file_watcher import file_watcher_service
 from app.services.pdf_processor import pdf_processor
 from app.services.storage import storage_service
 from app.services.vector_store import vector_store_service
+from app.utils.cache import status_cache
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 업로드 가능한 최대 파일 크기 (50MB)
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+
 
 class DocumentInfo(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     filename: str
     file_size: int
     status: str
+    chunk_count: int = 0
     created_at: datetime
     processed_at: Optional[datetime] = None
 
+    @field_validator("id", mode="before")
+    @classmethod
+    def _stringify_id(cls, value):
+        return str(value)
+
+    @field_validator("file_size", "chunk_count", mode="before")
+    @classmethod
+    def _default_zero(cls, value):
+        return value or 0
+
 
 class DocumentListResponse(BaseModel):
     documents: List[DocumentInfo]
     total: int
 
 
-def process_document_background(file_path: str, document_id: str):
-    """백그라운드에서 문서 처리 및 벡터화"""
-    try:
-        # 새로운 데이터베이스 세션 생성
-        from app.db.database import SessionLocal
+# ORM 객체 목록을 한 번에 검증하는 어댑터 (모듈 로드 시 한 번만 생성)
+document_list_adapter = TypeAdapter(List[DocumentInfo])
 
-        db = SessionLocal()
 
-        # 벡터 스토어에 추가
-        vector_store_service.add_document_chunks(db, document_id)
-
-        db.close()
-        print(f"문서 {document_id} 벡터화 완료")
-
-    except Exception as e:
-        print(f"백그라운드 문서 처리 오류: {e}")
+def run_in_session(func, *args):
+    """동기 세션이 필요한 서비스 함수를 새 세션으로 실행 (스레드에서 호출)"""
+    with SessionLocal() as db:
+        return func(*args, db)
 
 
 @router.get("/documents", response_model=DocumentListResponse)
 async def list_documents(
-    skip: int = 0, limit: int = 100, db: Session = Depends(get_db)
+    skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)
 ):
     """
     문서 목록 조회
@@ -76,52 +93,39 @@ async def list_documents(
     """
     try:
         # 전체 문서 수 조회
-        total = db.query(Document).count()
+        total = await db.scalar(select(func.count()).select_from(Document))
 
         # 문서 목록 조회
-        documents = db.query(Document).offset(skip).limit(limit).all()
-
-        document_list = [
-            DocumentInfo(
-                id=str(doc.id),
-                filename=doc.filename,
-                file_size=doc.file_size or 0,
-                status=doc.status,
-                created_at=doc.created_at,
-                processed_at=doc.processed_at,
-            )
-            for doc in documents
-        ]
+        documents = (
+            await db.scalars(select(Document).offset(skip).limit(limit))
+        ).all()
+
+        document_list = document_list_adapter.validate_python(documents)
 
         return DocumentListResponse(documents=document_list, total=total)
 
     except Exception as e:
-        print(f"문서 목록 조회 오류: {e}")
+        logger.error("문서 목록 조회 오류: %s", e)
         raise HTTPException(
             status_code=500, detail="문서 목록 조회 중 오류 발생"
         )
 
 
 @router.get("/documents/{document_id}")
-async def get_document_detail(document_id: str, db: Session = Depends(get_db)):
+async def get_document_detail(
+    document_id: str, db: AsyncSession = Depends(get_db)
+):
     """
     문서 상세 정보 조회
     """
     try:
         # 문서 조회
-        document = db.query(Document).filter(Document.id == document_id).first()
+        document = await db.get(Document, document_id)
         if not document:
             raise HTTPException(
                 status_code=404, detail="문서를 찾을 수 없습니다."
             )
 
-        # 청크 수 조회
-        chunk_count = (
-            db.query(DocumentChunk)
-            .filter(DocumentChunk.document_id == document_id)
-            .count()
-        )
-
         return {
             "id": str(document.id),
             "filename": document.filename,
@@ -130,58 +134,63 @@ async def get_document_detail(document_id: str, db: Session = Depends(get_db)):
             "status": document.status,
             "created_at": document.created_at,
             "processed_at": document.processed_at,
-            "chunk_count": chunk_count,
+            "chunk_count": document.chunk_count or 0,
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"문서 상세 조회 오류: {e}")
+        logger.error("문서 상세 조회 오류: %s", e)
         raise HTTPException(
             status_code=500, detail="문서 상세 조회 중 오류 발생"
         )
 
 
 @router.delete("/documents/{document_id}")
-async def delete_document(document_id: str, db: Session = Depends(get_db)):
+async def delete_document(
+    document_id: str, db: AsyncSession = Depends(get_db)
+):
     """
     문서 삭제 (데이터베이스 및 벡터 스토어에서)
     """
     try:
         # 문서 조회
-        document = db.query(Document).filter(Document.id == document_id).first()
+        document = await db.get(Document, document_id)
         if not document:
             raise HTTPException(
                 status_code=404, detail="문서를 찾을 수 없습니다."
             )
 
-        # 벡터 스토어에서 삭제
-        vector_store_service.delete_document(document_id)
-
-        # 데이터베이스에서 청크 삭제
-        db.query(DocumentChunk).filter(
-            DocumentChunk.document_id == document_id
-        ).delete()
-
-        # 문서 삭제
-        db.delete(document)
-        db.commit()
+        # 문서 삭제 (청크는 ON DELETE CASCADE로 함께 삭제)
+        await db.delete(document)
+        await db.commit()
+        status_cache.clear()
+
+        # 커밋이 성공한 뒤에 벡터 스토어에서 삭제
+        # (커밋 실패로 문서가 되살아나도 임베딩은 남아 있도록)
+        try:
+            await vector_store_service.adelete_documents([document_id])
+        except Exception as e:
+            logger.error(
+                "벡터 스토어 삭제 오류, 임베딩 수동 정리 필요 (문서 ID: %s): %s",
+                document_id,
+                e,
+            )
 
         return {"message": "문서가 성공적으로 삭제되었습니다."}
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"문서 삭제 오류: {e}")
-        db.rollback()
+        logger.error("문서 삭제 오류: %s", e)
+        await db.rollback()
         raise HTTPException(status_code=500, detail="문서 삭제 중 오류 발생")
 
 
 @router.post("/documents/upload")
 async def upload_pdf_document(
     file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = BackgroundTasks(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     PDF 파일 업로드 및 처리
@@ -195,53 +204,47 @@ async def upload_pdf_document(
                 status_code=400, detail="PDF 파일만 업로드 가능합니다."
             )
 
-        # 파일 크기 제한 (예: 50MB)
-        file_content = await file.read()
-        if len(file_content) > 50 * 1024 * 1024:  # 50MB
+        # 파일 크기 제한 (메모리로 읽지 않고 임시 파일에서 크기만 확인)
+        file.file.seek(0, 2)
+        file_size = file.file.tell()
+        file.file.seek(0)
+        if file_size > MAX_UPLOAD_SIZE:
             raise HTTPException(
-                status_code=400, detail="파일 크기는 50MB를 초과할 수 없습니다."
+                status_code=413, detail="파일 크기는 50MB를 초과할 수 없습니다."
             )
 
-        # 이미 처리된 문서인지 확인 (파일명 기준)
-        existing_doc = (
-            db.query(Document)
-            .filter(Document.filename == file.filename)
-            .first()
+        # 업로드된 임시 파일을 그대로 MinIO로 스트리밍하고 처리 및 벡터화
+        # (같은 내용의 문서가 이미 있으면 기존 문서 ID 반환)
+        document_id, created = await asyncio.to_thread(
+            run_in_session,
+            pdf_processor.process_pdf_from_upload,
+            file.file,
+            file.filename,
         )
 
-        if existing_doc:
+        document = await db.get(Document, uuid.UUID(document_id))
+        status = document.status if document else "unknown"
+
+        if not created:
             return {
                 "message": "이미 처리된 문서입니다.",
-                "document_id": str(existing_doc.id),
-                "status": existing_doc.status,
+                "document_id": document_id,
+                "status": status,
             }
 
-        # 파일을 MinIO에 업로드하고 처리
-        import io
-
-        file_stream = io.BytesIO(file_content)
-        document_id = pdf_processor.process_pdf_from_upload(
-            file_stream, file.filename, db
-        )
-
-        # 백그라운드에서 벡터화 작업 수행
-        background_tasks.add_task(
-            process_document_background,
-            None,  # 파일 경로가 아닌 storage에서 처리
-            document_id,
-        )
+        status_cache.clear()
 
         return {
-            "message": "파일 업로드 및 처리를 시작했습니다.",
+            "message": "파일 업로드 및 처리를 완료했습니다.",
             "document_id": document_id,
-            "status": "processing",
+            "status": status,
             "filename": file.filename,
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"파일 업로드 API 오류: {e}")
+        logger.error("파일 업로드 API 오류: %s", e)
         raise HTTPException(
             status_code=500, detail=f"파일 업로드 중 오류 발생: {str(e)}"
         )
@@ -250,8 +253,7 @@ async def upload_pdf_document(
 @router.post("/documents/process-from-storage")
 async def process_pdf_from_storage(
     object_name: str,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     MinIO Storage에서 PDF 문서 처리
@@ -260,17 +262,18 @@ async def process_pdf_from_storage(
     """
     try:
         # MinIO에서 파일 존재 확인
-        if not storage_service.file_exists(object_name):
+        file_exists = await asyncio.to_thread(
+            storage_service.file_exists, object_name
+        )
+        if not file_exists:
             raise HTTPException(
                 status_code=404,
                 detail=f"MinIO에서 파일을 찾을 수 없습니다: {object_name}",
             )
 
         # 이미 처리된 문서인지 확인
-        existing_doc = (
-            db.query(Document)
-            .filter(Document.file_path.like(f"%{object_name}"))
-            .first()
+        existing_doc = await db.scalar(
+            select(Document).where(Document.object_name == object_name)
         )
 
         if existing_doc:
@@ -280,25 +283,25 @@ async def process_pdf_from_storage(
                 "status": existing_doc.status,
             }
 
-        # PDF 처리 (청킹까지)
-        document_id = pdf_processor.process_pdf_from_storage(object_name, db)
-
-        # 백그라운드에서 벡터화 작업 수행
-        background_tasks.add_task(
-            process_document_background, None, document_id
+        # PDF 처리 (청킹 및 벡터화)
+        document_id = await asyncio.to_thread(
+            run_in_session, pdf_processor.process_pdf_from_storage, object_name
         )
+        status_cache.clear()
+
+        document = await db.get(Document, uuid.UUID(document_id))
 
         return {
-            "message": "문서 처리를 시작했습니다.",
+            "message": "문서 처리를 완료했습니다.",
             "document_id": document_id,
-            "status": "processing",
+            "status": document.status if document else "unknown",
             "object_name": object_name,
         }
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Storage 문서 처리 API 오류: {e}")
+        logger.error("Storage 문서 처리 API 오류: %s", e)
         raise HTTPException(
             status_code=500, detail=f"문서 처리 중 오류 발생: {str(e)}"
         )
@@ -310,13 +313,20 @@ async def list_storage_files():
     MinIO Storage에 저장된 파일 목록 조회
     """
     try:
-        files = storage_service.list_files()
-        pdf_files = [f for f in files if f.endswith(".pdf")]
+        cached = status_cache.get("storage_files")
+        if cached is not None:
+            return cached
 
-        return {"files": pdf_files, "total": len(pdf_files)}
+        pdf_files = await asyncio.to_thread(
+            storage_service.list_files, suffix=".pdf"
+        )
+
+        result = {"files": pdf_files, "total": len(pdf_files)}
+        status_cache.set("storage_files", result)
+        return result
 
     except Exception as e:
-        print(f"Storage 파일 목록 조회 오류: {e}")
+        logger.error("Storage 파일 목록 조회 오류: %s", e)
         raise HTTPException(
             status_code=500, detail="파일 목록 조회 중 오류 발생"
         )
@@ -349,7 +359,7 @@ async def get_file_download_url(object_name: str, expires_seconds: int = 3600):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"파일 URL 생성 오류: {e}")
+        logger.error("파일 URL 생성 오류: %s", e)
         raise HTTPException(status_code=500, detail="URL 생성 중 오류 발생")
 
 
@@ -370,13 +380,16 @@ class MinIOWebhookPayload(BaseModel):
 async def handle_minio_webhook(
     payload: MinIOWebhookPayload,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     MinIO Event Notification 웹훅 처리
 
     파일 업로드/삭제 시 자동으로 DB 동기화를 처리합니다.
     """
+    # 버킷 내용이 바뀌었으므로 상태 조회 캐시 무효화
+    status_cache.clear()
+
     try:
         processed_files = []
         deleted_files = []
@@ -395,31 +408,36 @@ async def handle_minio_webhook(
 
             # 파일 생성 이벤트 처리
             if event_name.startswith("s3:ObjectCreated:"):
-                # 이미 처리 중인지 확인
-                existing_doc = (
-                    db.query(Document)
-                    .filter(Document.file_path.like(f"%{object_name}"))
-                    .first()
+                # 이미 처리 중인지 확인 (문서 전체를 읽지 않고 EXISTS로 확인)
+                already_processed = await db.scalar(
+                    select(exists().where(Document.object_name == object_name))
                 )
 
-                if existing_doc:
-                    print(f"이미 처리된 파일입니다: {object_name}")
+                if already_processed:
+                    logger.info("이미 처리된 파일입니다: %s", object_name)
                     continue
 
-                print(f"새 PDF 파일 감지: {object_name} (이벤트: {event_name})")
-
-                # 백그라운드에서 처리
-                background_tasks.add_task(process_pdf_from_webhook, object_name, db)
+                logger.info(
+                    "새 PDF 파일 감지: %s (이벤트: %s)", object_name, event_name
+                )
                 processed_files.append(object_name)
 
             # 파일 삭제 이벤트 처리
             elif event_name.startswith("s3:ObjectRemoved:"):
-                print(f"PDF 파일 삭제 감지: {object_name} (이벤트: {event_name})")
+                logger.info(
+                    "PDF 파일 삭제 감지: %s (이벤트: %s)", object_name, event_name
+                )
 
                 # 백그라운드에서 삭제 처리
                 background_tasks.add_task(delete_file_from_webhook, object_name)
                 deleted_files.append(object_name)
 
+        # 새 파일들은 백그라운드에서 한 번에 병렬 처리
+        if processed_files:
+            background_tasks.add_task(
+                process_pdfs_from_webhook, processed_files
+            )
+
         response_message = []
         if processed_files:
             response_message.append(f"{len(processed_files)}개 파일 처리 시작")
@@ -433,98 +451,115 @@ async def handle_minio_webhook(
         }
 
     except Exception as e:
-        print(f"MinIO 웹훅 처리 오류: {e}")
+        logger.error("MinIO 웹훅 처리 오류: %s", e)
         # 웹훅은 실패해도 200을 반환해야 MinIO가 재시도하지 않음
         return {"error": str(e), "status": "failed"}
 
 
-async def process_pdf_from_webhook(object_name: str, db: Session):
-    """웹훅에서 호출되는 PDF 처리 함수"""
+async def process_pdfs_from_webhook(object_names: List[str]):
+    """웹훅에서 호출되는 PDF 일괄 처리 함수 (동시 처리 수 제한)"""
+
+    async def _guarded(object_name: str):
+        # 웹훅 요청마다 따로 제한하지 않고 File Watcher와 같은 세마포어 사용
+        async with file_watcher_service.ingest_semaphore:
+            # 블로킹 처리(다운로드, 청킹, 임베딩)는 스레드에서 실행
+            processed = await asyncio.to_thread(
+                process_pdf_from_webhook, object_name
+            )
+
+        # File Watcher의 처리 목록에 추가 (중복 처리 방지)
+        if processed:
+            await file_watcher_service.add_processed_file(object_name)
+
+    await asyncio.gather(*[_guarded(name) for name in object_names])
+
+
+def process_pdf_from_webhook(object_name: str) -> bool:
+    """웹훅에서 호출되는 PDF 처리 함수 (성공 여부 반환)"""
     try:
         # 새로운 데이터베이스 세션 생성
         from app.db.database import SessionLocal
 
         new_db = SessionLocal()
 
-        # PDF 처리 (청킹까지)
-        print(f"웹훅에서 PDF 처리 시작: {object_name}")
+        # PDF 처리 (청킹 및 벡터화)
+        logger.info("웹훅에서 PDF 처리 시작: %s", object_name)
         document_id = pdf_processor.process_pdf_from_storage(
             object_name, new_db
         )
 
-        # 벡터 스토어에 추가
-        vector_store_service.add_document_chunks(new_db, document_id)
-
-        # File Watcher의 처리 목록에 추가 (중복 처리 방지)
-        file_watcher_service.add_processed_file(object_name)
-
         new_db.close()
-        print(f"웹훅에서 PDF 처리 완료: {object_name} (문서 ID: {document_id})")
+        logger.info("웹훅에서 PDF 처리 완료: %s (문서 ID: %s)", object_name, document_id)
+        return True
 
     except Exception as e:
-        print(f"웹훅 PDF 처리 오류 ({object_name}): {e}")
+        logger.error("웹훅 PDF 처리 오류 (%s): %s", object_name, e)
         if "new_db" in locals():
             new_db.close()
+        return False
 
 
 async def delete_file_from_webhook(object_name: str):
     """웹훅에서 호출되는 파일 삭제 처리 함수"""
+    # 블로킹 DB/벡터 스토어 삭제는 스레드에서 실행
+    deleted = await asyncio.to_thread(
+        delete_documents_by_object_name, object_name
+    )
+
+    # File Watcher의 처리 목록에서 제거
+    if deleted:
+        await file_watcher_service.discard_processed_file(object_name)
+
+
+def delete_documents_by_object_name(object_name: str) -> bool:
+    """object_name에 해당하는 문서 삭제 (삭제 여부 반환)"""
     try:
         # 새로운 데이터베이스 세션 생성
         from app.db.database import SessionLocal
 
         new_db = SessionLocal()
 
-        print(f"웹훅에서 파일 삭제 처리 시작: {object_name}")
+        logger.info("웹훅에서 파일 삭제 처리 시작: %s", object_name)
 
-        # file_path로 문서 찾기
-        documents = (
-            new_db.query(Document)
-            .filter(Document.file_path.like(f"%{object_name}"))
-            .all()
-        )
+        # object_name으로 문서 ID만 조회
+        document_ids = new_db.execute(
+            select(Document.id).where(Document.object_name == object_name)
+        ).scalars().all()
 
-        if not documents:
-            print(f"삭제할 문서를 찾을 수 없습니다: {object_name}")
+        if not document_ids:
+            logger.info("삭제할 문서를 찾을 수 없습니다: %s", object_name)
             new_db.close()
-            return
-
-        deleted_count = 0
-        for document in documents:
-            document_id = str(document.id)
-
-            # 벡터 스토어에서 삭제
-            try:
-                vector_store_service.delete_document(document_id)
-                print(f"벡터 스토어에서 문서 삭제 완료: {document_id}")
-            except Exception as e:
-                print(f"벡터 스토어 삭제 오류 ({document_id}): {e}")
+            return False
 
-            # 데이터베이스에서 청크 삭제
-            chunks_deleted = new_db.query(DocumentChunk).filter(
-                DocumentChunk.document_id == document_id
-            ).delete()
-
-            # 문서 삭제
-            new_db.delete(document)
-            deleted_count += 1
+        # 벡터 스토어에서 일괄 삭제
+        try:
+            vector_store_service.delete_documents(
+                [str(document_id) for document_id in document_ids]
+            )
+        except Exception as e:
+            logger.error("벡터 스토어 삭제 오류 (%s): %s", object_name, e)
 
-            print(f"DB에서 문서 삭제 완료: {document.filename} (청크 {chunks_deleted}개)")
+        # 데이터베이스에서 문서 일괄 삭제 (청크는 ON DELETE CASCADE로 함께 삭제)
+        deleted_count = new_db.execute(
+            delete(Document).where(Document.id.in_(document_ids))
+        ).rowcount
 
-        # File Watcher의 처리 목록에서 제거
-        if object_name in file_watcher_service.processed_files:
-            file_watcher_service.processed_files.remove(object_name)
+        logger.info("DB에서 문서 삭제 완료: %s", object_name)
 
         new_db.commit()
         new_db.close()
 
-        print(f"웹훅에서 파일 삭제 처리 완료: {object_name} ({deleted_count}개 문서 삭제)")
+        logger.info(
+            "웹훅에서 파일 삭제 처리 완료: %s (%s개 문서 삭제)", object_name, deleted_count
+        )
+        return True
 
     except Exception as e:
-        print(f"웹훅 파일 삭제 처리 오류 ({object_name}): {e}")
+        logger.error("웹훅 파일 삭제 처리 오류 (%s): %s", object_name, e)
         if "new_db" in locals():
             new_db.rollback()
             new_db.close()
+        return False
 
 
 @router.get("/file-watcher/status")
@@ -563,45 +598,42 @@ async def force_file_watcher_check():
         }
 
     except Exception as e:
-        print(f"File Watcher 강제 실행 오류: {e}")
+        logger.error("File Watcher 강제 실행 오류: %s", e)
         raise HTTPException(
             status_code=500, detail=f"강제 실행 중 오류 발생: {str(e)}"
         )
 
 
 @router.get("/auto-processing/test")
-async def test_auto_processing():
+async def test_auto_processing(db: AsyncSession = Depends(get_db)):
     """
     자동 처리 시스템 테스트
 
     MinIO에 있는 미처리 파일들을 확인하고 처리 상태를 보고합니다.
     """
     try:
-        db = SessionLocal()
+        cached = status_cache.get("auto_processing")
+        if cached is not None:
+            return cached
 
         # MinIO의 모든 PDF 파일 조회
-        all_files = storage_service.list_files()
-        pdf_files = [f for f in all_files if f.endswith(".pdf")]
-
-        # 데이터베이스에서 처리된 파일들 조회
-        processed_docs = (
-            db.query(Document)
-            .filter(Document.file_path.like("minio://%"))
-            .all()
+        pdf_files = await asyncio.to_thread(
+            storage_service.list_files, suffix=".pdf"
         )
 
-        processed_files = set()
-        for doc in processed_docs:
-            if "/" in doc.file_path:
-                object_name = doc.file_path.split("/")[-1]
-                processed_files.add(object_name)
+        # 데이터베이스에서 처리된 파일들의 object name만 조회
+        processed_files = set(
+            await db.scalars(
+                select(Document.object_name).where(
+                    Document.file_path.like("minio://%")
+                )
+            )
+        )
 
         # 미처리 파일들
         unprocessed_files = [f for f in pdf_files if f not in processed_files]
 
-        db.close()
-
-        return {
+        result = {
             "total_files_in_minio": len(pdf_files),
             "processed_files_count": len(processed_files),
             "unprocessed_files_count": len(unprocessed_files),
@@ -609,9 +641,11 @@ async def test_auto_processing():
             "file_watcher_running": file_watcher_service.running,
             "webhook_endpoint": "/api/v1/minio/webhook",
         }
+        status_cache.set("auto_processing", result)
+        return result
 
     except Exception as e:
-        print(f"자동 처리 테스트 오류: {e}")
+        logger.error("자동 처리 테스트 오류: %s", e)
         raise HTTPException(
             status_code=500, detail=f"테스트 중 오류 발생: {str(e)}"
         )
@@ -625,7 +659,7 @@ async def get_minio_db_sync_status():
     orphaned 문서가 있는지 확인합니다.
     """
     try:
-        status = get_sync_status()
+        status = await asyncio.to_thread(get_sync_status)
         return {
             "minio_files": status["minio_files"],
             "db_documents": status["db_documents"],
@@ -635,7 +669,7 @@ async def get_minio_db_sync_status():
         }
 
     except Exception as e:
-        print(f"동기화 상태 조회 오류: {e}")
+        logger.error("동기화 상태 조회 오류: %s", e)
         raise HTTPException(
             status_code=500, detail=f"동기화 상태 조회 중 오류 발생: {str(e)}"
         )
@@ -649,11 +683,11 @@ async def manual_cleanup_orphaned_data():
     MinIO에 없는 파일들의 DB 데이터를 정리합니다.
     """
     try:
-        success = cleanup_orphaned_data_on_startup()
+        success = await asyncio.to_thread(cleanup_orphaned_data_on_startup)
 
         if success:
             # 정리 후 상태 재조회
-            status = get_sync_status()
+            status = await asyncio.to_thread(get_sync_status)
             return {
                 "message": "Orphaned 데이터 정리 완료",
                 "success": True,
@@ -671,7 +705,7 @@ async def manual_cleanup_orphaned_data():
             }
 
     except Exception as e:
-        print(f"수동 orphaned 데이터 정리 오류: {e}")
+        logger.error("수동 orphaned 데이터 정리 오류: %s", e)
         raise HTTPException(
             status_code=500, detail=f"정리 중 오류 발생: {str(e)}"
         )
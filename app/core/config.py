@@ -3,6 +3,7 @@
 """
 
 from functools import lru_cache
+from typing import Optional
 
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -11,6 +12,16 @@ from pydantic import Field
 class Settings(BaseSettings):
     # 데이터베이스 설정
     database_url: str = Field(env="DATABASE_URL")
+    sql_echo: bool = Field(default=False, env="SQL_ECHO")
+    db_pool_size: int = Field(default=20, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=40, env="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=1800, env="DB_POOL_RECYCLE")
+    # 체크아웃마다 연결 확인 쿼리 실행 여부 (불안정한 네트워크에서만 사용)
+    db_pool_pre_ping: bool = Field(default=False, env="DB_POOL_PRE_PING")
+    # psycopg prepared statement 임계값 (음수면 비활성화, PgBouncer용)
+    db_prepare_threshold: int = Field(default=0, env="DB_PREPARE_THRESHOLD")
+    # 시작 시 create_all로 테이블 생성 (운영에서는 Alembic 사용 후 비활성화)
+    auto_create_tables: bool = Field(default=True, env="AUTO_CREATE_TABLES")
 
     # MinIO 설정
     minio_endpoint: str = Field(env="MINIO_ENDPOINT")
@@ -20,6 +31,8 @@ class Settings(BaseSettings):
     minio_root_password: str = Field(env="MINIO_ROOT_PASSWORD")
     minio_bucket: str = Field(env="MINIO_BUCKET")
     minio_secure: bool = Field(env="MINIO_SECURE")
+    # MinIO HTTP 커넥션 풀 크기 (동시 업로드/다운로드 수 이상 권장)
+    minio_pool_size: int = Field(default=64, env="MINIO_POOL_SIZE")
 
     # AWS 설정
     aws_region: str = Field(env="AWS_REGION")
@@ -29,19 +42,68 @@ class Settings(BaseSettings):
     # Ollama 설정
     ollama_base_url: str = Field(env="OLLAMA_BASE_URL")
     ollama_model: str = Field(env="OLLAMA_MODEL")
+    # Ollama 추론 옵션 (미지정 시 Ollama 모델 기본값 사용)
+    ollama_num_ctx: Optional[int] = Field(default=None, env="OLLAMA_NUM_CTX")
+    ollama_num_thread: Optional[int] = Field(
+        default=None, env="OLLAMA_NUM_THREAD"
+    )
 
     # FastAPI 설정
     api_v1_str: str = "/api/v1"
     project_name: str = Field(env="PROJECT_NAME")
     debug: bool = Field(env="DEBUG")
+    # 로그 레벨 (운영에서는 WARNING 권장)
+    log_level: str = Field(default="INFO", env="LOG_LEVEL")
 
     # 임베딩 모델 설정
     embedding_model: str = Field(env="EMBEDDING_MODEL")
+    embedding_batch_size: int = Field(default=64, env="EMBEDDING_BATCH_SIZE")
+    # 동일한 질의 텍스트의 임베딩 캐시 크기 (LRU)
+    query_embedding_cache_size: int = Field(
+        default=4096, env="QUERY_EMBEDDING_CACHE_SIZE"
+    )
+    # 추론 장치 (미지정 시 CUDA 사용 가능 여부로 자동 선택)
+    embedding_device: Optional[str] = Field(
+        default=None, env="EMBEDDING_DEVICE"
+    )
+    # 추론 백엔드 (torch, onnx, openvino) 및 사용할 ONNX 파일 (예: 양자화 모델)
+    embedding_backend: str = Field(default="torch", env="EMBEDDING_BACKEND")
+    embedding_onnx_file: Optional[str] = Field(
+        default=None, env="EMBEDDING_ONNX_FILE"
+    )
+    # CPU 추론 스레드 수 (미지정 시 os.cpu_count())
+    torch_num_threads: Optional[int] = Field(
+        default=None, env="TORCH_NUM_THREADS"
+    )
 
     # 청킹 설정
     chunk_size: int = Field(env="CHUNK_SIZE")
     chunk_overlap: int = Field(env="CHUNK_OVERLAP")
 
+    # PDF 분할 처리 설정 (이 페이지 수 단위로 나누어 병렬 추출)
+    pdf_split_pages_per_chunk: int = Field(
+        default=64, env="PDF_SPLIT_PAGES_PER_CHUNK"
+    )
+
+    # 수집(ingestion) 설정
+    ingest_concurrency: int = Field(default=8, env="INGEST_CONCURRENCY")
+    # File Watcher가 폴링 대신 MinIO 버킷 알림을 사용할지 여부
+    file_watcher_notifications: bool = Field(
+        default=True, env="FILE_WATCHER_NOTIFICATIONS"
+    )
+
+    # 벡터 검색 설정 (HNSW 인덱스 검색 후보 수)
+    hnsw_ef_search: int = Field(default=40, env="HNSW_EF_SEARCH")
+
+    # 상태 조회 캐시 설정 (초)
+    status_cache_ttl: float = Field(default=10, env="STATUS_CACHE_TTL")
+
+    # 시맨틱 캐시 설정
+    semantic_cache_size: int = Field(default=10000, env="SEMANTIC_CACHE_SIZE")
+    semantic_cache_threshold: float = Field(
+        default=0.97, env="SEMANTIC_CACHE_THRESHOLD"
+    )
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,47 @@
+"""
+애플리케이션 로깅 설정
+"""
+
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging():
+    """루트 로거에 QueueHandler를 등록하고 출력은 백그라운드 스레드에서 처리"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.setLevel(settings.log_level.upper())
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력한 뒤 리스너 종료"""
+    global _listener
+    if _listener is None:
+        return
+
+    _listener.stop()
+    _listener = None
@@ -2,7 +2,15 @@
 데이터베이스 연결 및 세션 관리
 """
 
-from sqlalchemy import create_engine, text
+from typing import Any, Iterable, Sequence
+
+from psycopg import sql
+from sqlalchemy import Table, create_engine, make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -10,25 +18,59 @@ from app.core.config import get_settings
 
 settings = get_settings()
 
+# psycopg3: 반복 실행되는 쿼리를 서버 측 prepared statement로 재사용
+PSYCOPG_CONNECT_ARGS = {
+    "prepare_threshold": (
+        settings.db_prepare_threshold
+        if settings.db_prepare_threshold >= 0
+        else None
+    )
+}
+
+
+def engine_options() -> dict:
+    """엔진 공통 커넥션 풀 설정 (동기/비동기/벡터 스토어 엔진에서 공유)"""
+    options = {
+        # 체크아웃마다 SELECT 1 왕복을 피하고 pool_recycle로 오래된 연결 교체
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_recycle": settings.db_pool_recycle,
+        "echo": settings.sql_echo,
+    }
+    if make_url(settings.database_url).get_driver_name() == "psycopg":
+        options["connect_args"] = PSYCOPG_CONNECT_ARGS
+    return options
+
+
 # 데이터베이스 엔진 생성
-engine = create_engine(
-    settings.database_url, pool_pre_ping=True, echo=settings.debug
+engine = create_engine(settings.database_url, **engine_options())
+
+# 비동기 데이터베이스 엔진 생성 (psycopg 비동기 드라이버 사용)
+async_engine = create_async_engine(
+    make_url(settings.database_url).set(drivername="postgresql+psycopg"),
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    echo=settings.sql_echo,
+    connect_args=PSYCOPG_CONNECT_ARGS,
 )
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 # Base 클래스 생성
 Base = declarative_base()
 
 
-def get_db() -> Session:
-    """데이터베이스 세션 의존성"""
-    db = SessionLocal()
-    try:
+async def get_db() -> AsyncSession:
+    """데이터베이스 세션 의존성 (이벤트 루프를 막지 않는 비동기 세션)"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 def init_db():
@@ -42,5 +84,31 @@ def init_db():
             conn.execute(text("CREATE EXTENSION vector"))
             conn.commit()
 
-    # 모든 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    # 모든 테이블 생성 (Alembic으로 스키마를 관리하는 환경에서는 생략)
+    if settings.auto_create_tables:
+        Base.metadata.create_all(bind=engine)
+
+
+def bulk_copy(
+    session: Session,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+) -> int:
+    """PostgreSQL COPY를 이용한 대량 삽입 (세션의 현재 트랜잭션 사용)"""
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table.name),
+        sql.SQL(", ").join(sql.Identifier(column) for column in columns),
+    )
+
+    # 세션이 사용 중인 psycopg 원시 연결을 가져와 같은 트랜잭션에서 실행
+    dbapi_connection = session.connection().connection.dbapi_connection
+
+    count = 0
+    with dbapi_connection.cursor() as cursor:
+        with cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+
+    return count
@@ -3,38 +3,65 @@ FastAPI 메인 애플리케이션
 """
 
 import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1 import chat, documents
 from app.core.config import get_settings
+from app.core.logging import setup_logging, shutdown_logging
 from app.db.database import init_db
 from app.services.cleanup import cleanup_orphaned_data_on_startup
 from app.services.file_watcher import file_watcher_service
+from app.services.pdf_processor import pdf_processor
+from app.services.rag import rag_service
+from app.services.vector_store import vector_store_service
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 라이프사이클 관리"""
     # 시작 시 실행
-    print("애플리케이션 시작...")
+    setup_logging()
+    logger.info("애플리케이션 시작...")
 
     # 데이터베이스 초기화
     try:
         init_db()
-        print("데이터베이스 초기화 완료")
+        logger.info("데이터베이스 초기화 완료")
     except Exception as e:
-        print(f"데이터베이스 초기화 오류: {e}")
+        logger.error("데이터베이스 초기화 오류: %s", e)
+
+    # 벡터 검색용 HNSW 인덱스 확인 (없을 때만 쓰기를 막지 않고 생성)
+    try:
+        vector_store_service.ensure_hnsw_index()
+    except Exception as e:
+        logger.error("HNSW 인덱스 확인 오류: %s", e)
+
+    # PDF 파싱용 프로세스 풀 시작
+    try:
+        pdf_processor.start_pool()
+        logger.info("PDF 처리 프로세스 풀 시작")
+    except Exception as e:
+        logger.error("PDF 처리 프로세스 풀 시작 오류: %s", e)
 
     # Orphaned 데이터 정리 (시작 시 자동 실행)
     try:
         cleanup_orphaned_data_on_startup()
     except Exception as e:
-        print(f"Orphaned 데이터 정리 오류: {e}")
+        logger.error("Orphaned 데이터 정리 오류: %s", e)
+
+    # Ollama 모델 워밍업 (응답을 기다리지 않고 백그라운드에서 실행,
+    # 태스크가 수거되지 않도록 앱 수명 동안 참조 유지)
+    app.state.warmup_task = asyncio.create_task(
+        asyncio.to_thread(rag_service.warmup)
+    )
 
     # File Watcher 백그라운드 태스크 시작
     watcher_task = None
@@ -42,14 +69,14 @@ async def lifespan(app: FastAPI):
         watcher_task = asyncio.create_task(
             file_watcher_service.start_watching()
         )
-        print("File Watcher 백그라운드 태스크 시작")
+        logger.info("File Watcher 백그라운드 태스크 시작")
     except Exception as e:
-        print(f"File Watcher 시작 오류: {e}")
+        logger.error("File Watcher 시작 오류: %s", e)
 
     yield
 
     # 종료 시 실행
-    print("애플리케이션 종료...")
+    logger.info("애플리케이션 종료...")
 
     # File Watcher 정리
     if watcher_task:
@@ -58,9 +85,16 @@ async def lifespan(app: FastAPI):
         try:
             await watcher_task
         except asyncio.CancelledError:
-            print("File Watcher 태스크 정리 완료")
+            logger.info("File Watcher 태스크 정리 완료")
         except Exception as e:
-            print(f"File Watcher 정리 오류: {e}")
+            logger.error("File Watcher 정리 오류: %s", e)
+
+    # PDF 파싱용 프로세스 풀 종료
+    pdf_processor.shutdown_pool()
+    logger.info("PDF 처리 프로세스 풀 종료")
+
+    # 로그 큐 비우고 리스너 종료
+    shutdown_logging()
 
 
 # FastAPI 앱 생성
@@ -69,6 +103,7 @@ app = FastAPI(
     description="AI Planner Backend - RAG 기반 문서 질의응답 시스템",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS 설정
@@ -4,8 +4,19 @@
 
 import uuid
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.database import Base
@@ -19,13 +30,29 @@ class Document(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
+    object_name = Column(String(500), nullable=False)  # MinIO object key
+    content_sha256 = Column(String(64))  # 업로드 파일 내용 해시 (중복 방지)
     file_size = Column(Integer)
+    chunk_count = Column(Integer, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_at = Column(DateTime(timezone=True))
     status = Column(
         String(50), default="pending"
     )  # pending, processing, completed, error
 
+    # 청크는 DB의 ON DELETE CASCADE로 삭제 (ORM이 먼저 조회하지 않음)
+    chunks = relationship(
+        "DocumentChunk",
+        backref="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    __table_args__ = (
+        Index("ix_documents_object_name", "object_name", unique=True),
+        Index("ix_documents_content_sha256", "content_sha256", unique=True),
+    )
+
 
 class DocumentChunk(Base):
     """문서 청크 테이블"""
@@ -33,8 +60,26 @@ class DocumentChunk(Base):
     __tablename__ = "document_chunks"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    document_id = Column(UUID(as_uuid=True), nullable=False)
+    document_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+    )
     chunk_index = Column(Integer, nullable=False)
     content = Column(Text, nullable=False)
     page_number = Column(Integer)
+    content_sha256 = Column(String(64))  # 청크 내용 해시 (임베딩 캐시 키)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("ix_document_chunks_document_id", "document_id"),)
+
+
+class EmbeddingCache(Base):
+    """청크 내용 해시 기반 임베딩 캐시 테이블"""
+
+    __tablename__ = "embedding_cache"
+
+    content_hash = Column(String(64), primary_key=True)  # SHA-256 hex
+    model = Column(String(255), primary_key=True)
+    embedding = Column(Vector(), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -2,70 +2,76 @@
 MinIO-DB 동기화 및 orphaned 데이터 정리 서비스
 """
 
-from typing import List
+import logging
+from typing import FrozenSet, List, Optional
 
+from sqlalchemy import func
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
 from app.db.database import SessionLocal
-from app.models.documents import Document, DocumentChunk
+from app.models.documents import Document
 from app.services.storage import storage_service
 from app.services.vector_store import vector_store_service
+from app.utils.cache import status_cache
 
+logger = logging.getLogger(__name__)
 
-def get_minio_pdf_files() -> set:
-    """MinIO에서 PDF 파일 목록 조회"""
+
+def get_minio_pdf_files() -> Optional[FrozenSet[str]]:
+    """MinIO에서 PDF 파일 목록 조회 (조회 실패 시 None)"""
     try:
-        minio_files = storage_service.list_files()
-        return set(f for f in minio_files if f.endswith('.pdf'))
+        # 중간 리스트 없이 목록을 받아오면서 바로 집합에 추가
+        # (정리 대상 판정에는 오탐 없는 정확한 집합이 필요)
+        return frozenset(storage_service.iter_files(suffix='.pdf'))
     except Exception as e:
-        print(f"MinIO 파일 목록 조회 오류: {e}")
-        return set()
-
-
-def find_orphaned_documents(db: Session, minio_pdf_files: set) -> List[Document]:
-    """orphaned 문서 찾기"""
-    db_documents = db.query(Document).all()
-    orphaned_docs = []
-
-    for doc in db_documents:
-        # file_path에서 파일명 추출
-        if doc.file_path.startswith('minio://'):
-            file_name = doc.file_path.split('/')[-1]
-        else:
-            file_name = doc.filename
-
-        # MinIO에 파일이 없으면 orphaned
-        if file_name not in minio_pdf_files:
-            orphaned_docs.append(doc)
+        logger.error("MinIO 파일 목록 조회 오류: %s", e)
+        # 빈 목록으로 취급하면 모든 문서가 정리 대상이 되므로 구분
+        return None
+
+
+def find_orphaned_documents(
+    db: Session, minio_pdf_files: FrozenSet[str]
+) -> List[Row]:
+    """orphaned 문서 찾기 (필요한 컬럼만 나누어 스트리밍 조회)"""
+    # 처리 중인 문서는 업로드 전에 레코드를 먼저 만들므로 제외
+    db_documents = (
+        db.query(Document.id, Document.filename, Document.object_name)
+        .filter(Document.status.is_distinct_from("processing"))
+        .yield_per(1000)
+    )
+
+    # 루프마다 속성 조회를 하지 않도록 멤버십 검사 메서드를 미리 바인딩
+    in_minio = minio_pdf_files.__contains__
+
+    # 문서의 object key(하위 경로 포함)가 MinIO에 없으면 orphaned
+    orphaned_docs = [
+        doc for doc in db_documents if not in_minio(doc.object_name)
+    ]
 
     return orphaned_docs
 
 
-def delete_orphaned_document(db: Session, doc: Document) -> bool:
-    """단일 orphaned 문서 삭제"""
-    try:
-        document_id = str(doc.id)
-
-        # 벡터 스토어에서 삭제
-        try:
-            vector_store_service.delete_document(document_id)
-        except Exception as e:
-            print(f"벡터 스토어 삭제 오류 ({doc.filename}): {e}")
+def delete_orphaned_documents(db: Session, orphaned_docs: List[Row]) -> int:
+    """orphaned 문서들을 한 번의 DELETE로 삭제 (청크는 ON DELETE CASCADE)"""
+    document_ids = [doc.id for doc in orphaned_docs]
 
-        # DB에서 청크 삭제
-        chunks_deleted = db.query(DocumentChunk).filter(
-            DocumentChunk.document_id == document_id
-        ).delete()
+    # 벡터 스토어에서 일괄 삭제
+    try:
+        vector_store_service.delete_documents(
+            [str(document_id) for document_id in document_ids]
+        )
+    except Exception as e:
+        logger.error("벡터 스토어 삭제 오류: %s", e)
 
-        # 문서 삭제
-        db.delete(doc)
+    # DB에서 문서 일괄 삭제 (청크는 DB가 함께 삭제)
+    documents_deleted = db.query(Document).filter(
+        Document.id.in_(document_ids)
+    ).delete(synchronize_session=False)
 
-        print(f"✅ orphaned 문서 삭제 완료: {doc.filename} (청크 {chunks_deleted}개)")
-        return True
-
-    except Exception as e:
-        print(f"❌ orphaned 문서 삭제 실패 ({doc.filename}): {e}")
-        return False
+    for doc in orphaned_docs:
+        logger.debug("✅ orphaned 문서 삭제: %s", doc.filename)
+    return documents_deleted
 
 
 def cleanup_orphaned_data_on_startup() -> bool:
@@ -76,43 +82,44 @@ def cleanup_orphaned_data_on_startup() -> bool:
         bool: 정리 성공 여부
     """
     try:
-        print("🧹 Orphaned 데이터 정리 시작...")
-
-        db = SessionLocal()
+        logger.info("🧹 Orphaned 데이터 정리 시작...")
 
-        # 1. MinIO 파일 목록 조회
+        # 1. MinIO 파일 목록 조회 (조회 실패 시 정리하지 않음)
         minio_pdf_files = get_minio_pdf_files()
+        if minio_pdf_files is None:
+            logger.warning("MinIO 파일 목록을 조회할 수 없어 정리를 건너뜁니다.")
+            return False
+
+        db = SessionLocal()
 
         # 2. orphaned 문서 찾기
         orphaned_docs = find_orphaned_documents(db, minio_pdf_files)
 
         if not orphaned_docs:
-            print("✅ 정리할 orphaned 데이터가 없습니다.")
+            logger.info("✅ 정리할 orphaned 데이터가 없습니다.")
             db.close()
             return True
 
-        print(f"🗑️  {len(orphaned_docs)}개의 orphaned 문서 발견")
-        print(f"   MinIO 파일: {len(minio_pdf_files)}개")
-        print(f"   정리 대상: {len(orphaned_docs)}개")
+        logger.info("🗑️  %s개의 orphaned 문서 발견", len(orphaned_docs))
+        logger.info("   MinIO 파일: %s개", len(minio_pdf_files))
+        logger.info("   정리 대상: %s개", len(orphaned_docs))
 
-        # 3. orphaned 문서들 삭제
-        cleaned_count = 0
-        for doc in orphaned_docs:
-            if delete_orphaned_document(db, doc):
-                cleaned_count += 1
+        # 3. orphaned 문서들 일괄 삭제
+        cleaned_count = delete_orphaned_documents(db, orphaned_docs)
 
         # 4. 변경사항 커밋
         db.commit()
         db.close()
+        status_cache.clear()
 
-        print("🎉 Orphaned 데이터 정리 완료!")
-        print(f"   정리된 문서: {cleaned_count}개")
-        print(f"   실패한 문서: {len(orphaned_docs) - cleaned_count}개")
+        logger.info("🎉 Orphaned 데이터 정리 완료!")
+        logger.info("   정리된 문서: %s개", cleaned_count)
+        logger.info("   실패한 문서: %s개", len(orphaned_docs) - cleaned_count)
 
         return True
 
     except Exception as e:
-        print(f"❌ Orphaned 데이터 정리 오류: {e}")
+        logger.error("❌ Orphaned 데이터 정리 오류: %s", e)
         if 'db' in locals():
             db.rollback()
             db.close()
@@ -126,29 +133,37 @@ def get_sync_status() -> dict:
     Returns:
         dict: 동기화 상태 정보
     """
-    try:
-        db = SessionLocal()
+    cached = status_cache.get("sync_status")
+    if cached is not None:
+        return cached
 
-        # MinIO 파일 조회
+    try:
+        # MinIO 파일 조회 (조회 실패 시 orphaned 문서를 판정하지 않음)
         minio_pdf_files = get_minio_pdf_files()
+        if minio_pdf_files is None:
+            raise RuntimeError("MinIO 파일 목록을 조회할 수 없습니다.")
 
-        # DB 문서 조회
-        db_documents = db.query(Document).all()
+        db = SessionLocal()
+
+        # DB 문서 수 조회
+        db_document_count = db.query(func.count(Document.id)).scalar()
 
         # orphaned 문서 찾기
         orphaned_docs = find_orphaned_documents(db, minio_pdf_files)
 
         db.close()
 
-        return {
+        status = {
             "minio_files": len(minio_pdf_files),
-            "db_documents": len(db_documents),
+            "db_documents": db_document_count,
             "orphaned_documents": len(orphaned_docs),
             "is_synced": len(orphaned_docs) == 0,
         }
+        status_cache.set("sync_status", status)
+        return status
 
     except Exception as e:
-        print(f"동기화 상태 조회 오류: {e}")
+        logger.error("동기화 상태 조회 오류: %s", e)
         return {
             "minio_files": 0,
             "db_documents": 0,
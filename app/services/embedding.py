@@ -2,34 +2,111 @@
 임베딩 생성 서비스
 """
 
-from typing import List
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 
 from app.core.config import get_settings
 
 settings = get_settings()
 
+# CPU 추론(GEMM)에 사용할 스레드 풀 설정 (병렬 작업 시작 전에 한 번만 설정 가능)
+torch.set_num_threads(settings.torch_num_threads or os.cpu_count() or 1)
+try:
+    torch.set_num_interop_threads(2)
+except RuntimeError:
+    # 이미 병렬 작업이 시작된 경우 변경 불가
+    pass
+
 
 class EmbeddingService:
     def __init__(self):
-        self.model = SentenceTransformer(settings.embedding_model)
+        self.device = settings.embedding_device or (
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+        self.model = SentenceTransformer(
+            settings.embedding_model,
+            device=self.device,
+            backend=settings.embedding_backend,
+            model_kwargs=self._model_kwargs(),
+        )
+        # GPU에서는 FP16으로 추론 (MiniLM은 정밀도 손실이 거의 없음)
+        is_cuda = self.device.startswith("cuda")
+        if settings.embedding_backend == "torch" and is_cuda:
+            self.model.half()
         self.dimension = self.model.get_sentence_embedding_dimension()
+        self.batch_size = settings.embedding_batch_size
+        # 같은 질의 텍스트는 다시 인코딩하지 않도록 LRU 캐시 (스레드 안전)
+        self._embed_query_cached = lru_cache(
+            maxsize=settings.query_embedding_cache_size
+        )(self._embed_query_array)
+
+        # 첫 요청이 커널 선택/초기화 비용을 떠안지 않도록 미리 워밍업
+        self._warmup()
+
+    def _warmup(self):
+        """더미 배치를 한 번 인코딩하여 추론 경로 초기화"""
+        if self.device.startswith("cuda"):
+            # 입력 크기별로 가장 빠른 cuDNN 커널을 골라 캐시
+            torch.backends.cudnn.benchmark = True
+
+        self.embed_documents_np(["warmup"] * 8)
+
+        if self.device.startswith("cuda"):
+            torch.cuda.synchronize()
+
+    @staticmethod
+    def _model_kwargs() -> Optional[Dict[str, Any]]:
+        """ONNX 백엔드에서 사용할 모델 파일 지정 (예: INT8 양자화 모델)"""
+        if (
+            settings.embedding_backend == "onnx"
+            and settings.embedding_onnx_file
+        ):
+            return {"file_name": settings.embedding_onnx_file}
+        return None
 
     def embed_text(self, text: str) -> List[float]:
         """단일 텍스트를 임베딩으로 변환"""
-        embedding = self.model.encode(text)
-        return embedding.tolist()
+        # 단일 문자열도 배치 경로로 처리 (추론 설정을 한 곳에서 관리)
+        return self.embed_texts([text])[0]
+
+    def embed_documents_np(self, texts: List[str]) -> np.ndarray:
+        """여러 텍스트를 (텍스트 수, 차원) float32 배열로 변환"""
+        # encode()가 내부에서 길이순 정렬 후 배치를 구성하고 원래 순서로
+        # 되돌리므로(smart batching) 전체 목록을 한 번에 넘김
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                # 단위 벡터로 정규화 (코사인 거리 = 1 - 내적)
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+        # FP16 모델 출력도 float32로 통일 (이미 float32면 복사하지 않음)
+        return embeddings.astype(np.float32, copy=False)
 
     def embed_texts(self, texts: List[str]) -> List[List[float]]:
         """여러 텍스트를 임베딩으로 변환"""
-        embeddings = self.model.encode(texts)
-        return embeddings.tolist()
+        return self.embed_documents_np(texts).tolist()
+
+    def _embed_query_array(self, text: str) -> np.ndarray:
+        """캐시 저장용 읽기 전용 임베딩 배열"""
+        embedding = self.embed_documents_np([text])[0]
+        embedding.flags.writeable = False
+        return embedding
+
+    def embed_query_np(self, text: str) -> np.ndarray:
+        """쿼리 텍스트를 float32 배열로 변환 (캐시 사용, 수정 불가)"""
+        return self._embed_query_cached(text)
 
     def embed_query(self, text: str) -> List[float]:
-        """쿼리 텍스트를 임베딩으로 변환 (langchain 호환)"""
-        return self.embed_text(text)
+        """쿼리 텍스트를 임베딩으로 변환 (langchain 호환, 캐시 사용)"""
+        return self.embed_query_np(text).tolist()
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """문서들을 임베딩으로 변환 (langchain 호환)"""
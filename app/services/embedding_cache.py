@@ -0,0 +1,97 @@
+"""
+청크 내용 해시 기반 임베딩 캐시 서비스
+"""
+
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.documents import EmbeddingCache
+from app.services.embedding import embedding_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCacheService:
+    def __init__(self):
+        # 양자화 ONNX 모델은 결과가 달라지므로 캐시 키를 분리
+        self.model_name = settings.embedding_model
+        if (
+            settings.embedding_backend == "onnx"
+            and settings.embedding_onnx_file
+        ):
+            self.model_name += f"#{settings.embedding_onnx_file}"
+        self.embedding_function = embedding_service
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """텍스트 내용의 SHA-256 해시"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def embed_documents(
+        self,
+        db: Session,
+        texts: List[str],
+        hashes: Optional[List[str]] = None,
+    ) -> List[np.ndarray]:
+        """캐시를 먼저 조회하고 캐시에 없는 텍스트만 임베딩
+
+        hashes가 주어지면 (청킹 시 계산된 content_sha256) 재계산하지 않음
+        """
+        if hashes is None:
+            hashes = [self.content_hash(text) for text in texts]
+
+        # 캐시된 임베딩 일괄 조회
+        rows = (
+            db.query(EmbeddingCache.content_hash, EmbeddingCache.embedding)
+            .filter(
+                EmbeddingCache.model == self.model_name,
+                EmbeddingCache.content_hash.in_(set(hashes)),
+            )
+            .all()
+        )
+        # pgvector가 float32 배열로 반환하므로 리스트로 변환하지 않음
+        cached: Dict[str, np.ndarray] = dict(rows)
+
+        # 캐시에 없는 텍스트만 중복 없이 모아서 한 번에 임베딩
+        misses: Dict[str, str] = {}
+        for content_hash, text in zip(hashes, texts):
+            if content_hash not in cached:
+                misses.setdefault(content_hash, text)
+
+        if misses:
+            new_embeddings = self.embedding_function.embed_documents_np(
+                list(misses.values())
+            )
+            cached.update(zip(misses.keys(), new_embeddings))
+
+            # 커밋은 호출자가 문서 상태와 함께 수행 (중간 커밋 없음)
+            # 동시 수집 시 교착 상태가 없도록 해시 순서로 삽입
+            db.execute(
+                insert(EmbeddingCache).on_conflict_do_nothing(),
+                [
+                    {
+                        "content_hash": content_hash,
+                        "model": self.model_name,
+                        "embedding": cached[content_hash],
+                    }
+                    for content_hash in sorted(misses)
+                ],
+            )
+
+        logger.info(
+            "임베딩 캐시: %s개 중 %s개 재사용",
+            len(texts),
+            len(texts) - len(misses),
+        )
+        return [cached[content_hash] for content_hash in hashes]
+
+
+# 전역 임베딩 캐시 서비스 인스턴스
+embedding_cache_service = EmbeddingCacheService()
@@ -3,132 +3,240 @@
 """
 
 import asyncio
+import logging
+import threading
 import time
-from typing import Set
+from typing import List, Optional, Set
+from urllib.parse import unquote_plus
 
+from sqlalchemy import exists, select
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.db.database import SessionLocal
 from app.models.documents import Document
 from app.services.pdf_processor import pdf_processor
 from app.services.storage import storage_service
-from app.services.vector_store import vector_store_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class FileWatcherService:
     def __init__(self, check_interval: int = 30):
         self.check_interval = check_interval  # 초 단위
         self.processed_files: Set[str] = set()
+        # 웹훅과 주기 검사가 동시에 목록을 수정하지 않도록 보호
+        self._lock = asyncio.Lock()
+        # 동시에 처리할 파일 수 제한 (CPU/GPU 사용량 보호, 웹훅과 공유)
+        self.ingest_semaphore = asyncio.Semaphore(settings.ingest_concurrency)
         self.running = False
+        # MinIO 버킷 알림 수신 스레드 (알림 사용 시)
+        self._listener: Optional[threading.Thread] = None
 
     async def start_watching(self):
         """파일 감시 시작"""
         self.running = True
-        print(f"File Watcher 시작 (체크 간격: {self.check_interval}초)")
+        logger.info("File Watcher 시작 (체크 간격: %s초)", self.check_interval)
 
         # 기존 처리된 파일들 로드
         await self._load_processed_files()
 
+        # 중지된 동안 추가된 파일을 한 번 확인한 뒤 버킷 알림으로 전환
+        await self._check_new_files()
+        if settings.file_watcher_notifications:
+            self._start_listener(asyncio.get_running_loop())
+
         while self.running:
             try:
-                await self._check_new_files()
                 await asyncio.sleep(self.check_interval)
+
+                # 알림 수신이 중단된 경우에만 전체 목록을 주기적으로 확인
+                if not self._listener_alive():
+                    await self._check_new_files()
             except Exception as e:
-                print(f"File Watcher 오류: {e}")
-                await asyncio.sleep(self.check_interval)
+                logger.error("File Watcher 오류: %s", e)
+
+    def _start_listener(self, loop: asyncio.AbstractEventLoop):
+        """MinIO 버킷 알림 수신 스레드 시작"""
+        # 알림 스트림은 블로킹이므로 종료 시 기다리지 않도록 데몬 스레드 사용
+        self._listener = threading.Thread(
+            target=self._listen_notifications,
+            args=(loop,),
+            name="minio-notification-listener",
+            daemon=True,
+        )
+        self._listener.start()
+
+    def _listener_alive(self) -> bool:
+        """버킷 알림 수신 스레드 동작 여부"""
+        return self._listener is not None and self._listener.is_alive()
+
+    def _listen_notifications(self, loop: asyncio.AbstractEventLoop):
+        """새 PDF 업로드 알림을 받아 이벤트 루프에 처리 요청 (스레드에서 실행)"""
+        try:
+            events = storage_service.client.listen_bucket_notification(
+                storage_service.bucket_name,
+                suffix=".pdf",
+                events=("s3:ObjectCreated:*",),
+            )
+            logger.info("MinIO 버킷 알림 수신 시작")
+
+            with events:
+                for event in events:
+                    if not self.running:
+                        break
+
+                    for record in event.get("Records", []):
+                        # 알림의 object key는 URL 인코딩되어 있음
+                        object_name = unquote_plus(
+                            record["s3"]["object"]["key"]
+                        )
+                        asyncio.run_coroutine_threadsafe(
+                            self._process_new_file(object_name), loop
+                        )
+
+        except Exception as e:
+            if self.running:
+                logger.warning(
+                    "MinIO 버킷 알림 수신 중단, 주기적 확인으로 전환: %s", e
+                )
 
     def stop_watching(self):
         """파일 감시 중지"""
         self.running = False
-        print("File Watcher 중지됨")
+        logger.info("File Watcher 중지됨")
 
     async def _load_processed_files(self):
         """데이터베이스에서 이미 처리된 파일 목록 로드"""
         try:
-            db = SessionLocal()
+            # MinIO 경로가 포함된 문서들의 object name만 조회 (스레드에서 실행)
+            object_names = await asyncio.to_thread(self._query_object_names)
 
-            # MinIO 경로가 포함된 문서들 조회
-            documents = (
-                db.query(Document)
-                .filter(Document.file_path.like("minio://%"))
-                .all()
-            )
+            async with self._lock:
+                self.processed_files.update(object_names)
 
-            for doc in documents:
-                # file_path에서 object_name 추출
-                if "/" in doc.file_path:
-                    object_name = doc.file_path.split("/")[-1]
-                    self.processed_files.add(object_name)
-
-            db.close()
-            print(f"기존 처리된 파일 {len(self.processed_files)}개 로드됨")
+            logger.info(
+                "기존 처리된 파일 %s개 로드됨", len(self.processed_files)
+            )
 
         except Exception as e:
-            print(f"처리된 파일 로드 오류: {e}")
+            logger.error("처리된 파일 로드 오류: %s", e)
+
+    @staticmethod
+    def _query_object_names() -> List[str]:
+        """처리된 문서의 object name 목록 조회"""
+        with SessionLocal() as db:
+            return (
+                db.execute(
+                    select(Document.object_name).where(
+                        Document.file_path.like("minio://%")
+                    )
+                )
+                .scalars()
+                .all()
+            )
+
+    @staticmethod
+    def _query_existing_object_names(object_names: List[str]) -> Set[str]:
+        """주어진 object name 중 이미 문서가 있는 것만 조회"""
+        with SessionLocal() as db:
+            return set(
+                db.execute(
+                    select(Document.object_name).where(
+                        Document.object_name.in_(object_names)
+                    )
+                ).scalars()
+            )
 
     async def _check_new_files(self):
         """새로운 파일 확인 및 처리"""
         try:
-            # MinIO에서 PDF 파일 목록 조회
-            all_files = storage_service.list_files()
-            pdf_files = [f for f in all_files if f.endswith(".pdf")]
+            # MinIO에서 PDF 파일 목록 조회 (블로킹 호출이므로 스레드에서 실행)
+            pdf_files = await asyncio.to_thread(
+                storage_service.list_files, suffix=".pdf"
+            )
 
             # 새로운 파일 찾기
             new_files = [f for f in pdf_files if f not in self.processed_files]
 
+            # 웹훅 등으로 이미 처리된 파일은 한 번의 쿼리로 걸러냄
+            if new_files:
+                existing = await asyncio.to_thread(
+                    self._query_existing_object_names, new_files
+                )
+                if existing:
+                    async with self._lock:
+                        self.processed_files.update(existing)
+                    new_files = [f for f in new_files if f not in existing]
+
             if new_files:
-                print(f"새로운 파일 {len(new_files)}개 발견: {new_files}")
+                logger.info(
+                    "새로운 파일 %s개 발견: %s", len(new_files), new_files
+                )
 
-                for file_name in new_files:
-                    await self._process_new_file(file_name)
+                # 여러 파일을 동시에 처리 (동시 처리 수는 세마포어로 제한)
+                await asyncio.gather(
+                    *(self._process_new_file(name) for name in new_files)
+                )
 
         except Exception as e:
-            print(f"새 파일 확인 오류: {e}")
+            logger.error("새 파일 확인 오류: %s", e)
 
     async def _process_new_file(self, object_name: str):
         """새 파일 처리"""
-        try:
-            print(f"File Watcher에서 처리 시작: {object_name}")
-
-            db = SessionLocal()
+        if object_name in self.processed_files:
+            return
 
-            # 이미 처리 중인지 다시 확인
-            existing_doc = (
-                db.query(Document)
-                .filter(Document.file_path.like(f"%{object_name}"))
-                .first()
-            )
+        # 블로킹 처리(다운로드, 청킹, 임베딩)는 스레드에서 실행
+        async with self.ingest_semaphore:
+            processed = await asyncio.to_thread(self._process_file, object_name)
 
-            if existing_doc:
-                print(f"이미 처리된 파일입니다: {object_name}")
-                self.processed_files.add(object_name)
-                db.close()
-                return
+        # 처리 완료 표시
+        if processed:
+            await self.add_processed_file(object_name)
 
-            # PDF 처리
-            document_id = pdf_processor.process_pdf_from_storage(
-                object_name, db
-            )
-
-            # 벡터 스토어에 추가
-            vector_store_service.add_document_chunks(db, document_id)
-
-            # 처리 완료 표시
-            self.processed_files.add(object_name)
-
-            db.close()
-            print(
-                f"File Watcher에서 처리 완료: {object_name} (문서 ID: {document_id})"
+    def _process_file(self, object_name: str) -> bool:
+        """새 파일 처리 (처리 완료 또는 이미 처리된 경우 True)"""
+        try:
+            logger.info("File Watcher에서 처리 시작: %s", object_name)
+
+            # 풀에서 연결을 빌려 확인과 처리를 한 세션으로 수행
+            with SessionLocal() as db:
+                # 이미 처리 중인지 다시 확인 (유니크 인덱스로 EXISTS 조회)
+                already_processed = db.scalar(
+                    select(exists().where(Document.object_name == object_name))
+                )
+
+                if already_processed:
+                    logger.info("이미 처리된 파일입니다: %s", object_name)
+                    return True
+
+                # PDF 처리 (청킹 및 벡터화)
+                document_id = pdf_processor.process_pdf_from_storage(
+                    object_name, db
+                )
+
+            logger.info(
+                "File Watcher에서 처리 완료: %s (문서 ID: %s)",
+                object_name,
+                document_id,
             )
+            return True
 
         except Exception as e:
-            print(f"File Watcher 파일 처리 오류 ({object_name}): {e}")
-            if "db" in locals():
-                db.close()
+            logger.error("File Watcher 파일 처리 오류 (%s): %s", object_name, e)
+            return False
 
-    def add_processed_file(self, object_name: str):
+    async def add_processed_file(self, object_name: str):
         """처리 완료된 파일을 목록에 추가 (중복 처리 방지)"""
-        self.processed_files.add(object_name)
+        async with self._lock:
+            self.processed_files.add(object_name)
+
+    async def discard_processed_file(self, object_name: str):
+        """삭제된 파일을 목록에서 제거"""
+        async with self._lock:
+            self.processed_files.discard(object_name)
 
 
 # 전역 File Watcher 인스턴스
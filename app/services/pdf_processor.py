@@ -2,23 +2,55 @@
 PDF 문서 처리 및 청킹 서비스
 """
 
+import hashlib
 import io
+import logging
+import math
 import os
 import tempfile
+import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Any, BinaryIO, Dict, List, Union
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from pypdf import PdfReader
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
+from app.db.database import bulk_copy
 from app.models.documents import Document, DocumentChunk
 from app.services.embedding import embedding_service
+from app.services.embedding_cache import embedding_cache_service
 from app.services.storage import storage_service
+from app.services.vector_store import vector_store_service
+from app.utils.pdf import (
+    extract_page_range,
+    extract_pages_text,
+    split_page_ranges,
+)
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 프로세스 풀 작업 하나가 맡는 최소 페이지 수 (작업마다 PDF를 다시 여는 비용 상쇄)
+MIN_PAGES_PER_TASK = 8
+
+# 이 개수를 초과하는 청크는 ORM 대신 COPY로 저장
+COPY_THRESHOLD = 100
+CHUNK_COPY_COLUMNS = (
+    "id",
+    "document_id",
+    "chunk_index",
+    "content",
+    "page_number",
+    "content_sha256",
+)
 
 
 class PDFProcessor:
@@ -29,6 +61,34 @@ class PDFProcessor:
             length_function=len,
             separators=["\n\n", "\n", " ", ""],
         )
+        # 텍스트 추출용 상주 프로세스 풀 (애플리케이션 수명 동안 재사용)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # 여러 수집 스레드가 동시에 풀을 다시 만들지 않도록 보호
+        self._pool_lock = threading.Lock()
+
+    def start_pool(self):
+        """PDF 파싱용 프로세스 풀 시작 (애플리케이션 시작 시 호출)"""
+        if self._pool is None:
+            # 자식 프로세스가 모델/클라이언트 상태를 복제하지 않도록 spawn 사용
+            self._pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=get_context("spawn")
+            )
+
+    def shutdown_pool(self):
+        """PDF 파싱용 프로세스 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _restart_pool(self, broken: ProcessPoolExecutor):
+        """워커가 비정상 종료되어 손상된 풀을 새 풀로 교체"""
+        with self._pool_lock:
+            # 다른 스레드가 이미 교체했거나 애플리케이션이 종료 중이면 유지
+            if self._pool is broken:
+                logger.warning("PDF 파싱 프로세스 풀 손상, 다시 시작합니다.")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self.start_pool()
 
     def extract_text_from_pdf(
         self, file_data: Union[str, BinaryIO, io.BytesIO]
@@ -36,20 +96,80 @@ class PDFProcessor:
         """PDF에서 텍스트 추출 (파일 경로 또는 파일 데이터)"""
         try:
             reader = PdfReader(file_data)
-            pages_text = []
+            page_count = len(reader.pages)
+            pages_per_chunk = settings.pdf_split_pages_per_chunk
 
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                if text.strip():
-                    pages_text.append(
-                        {"page_number": page_num, "text": text.strip()}
-                    )
+            # 상주 풀이 없으면 작은 PDF는 현재 프로세스에서 바로 추출
+            if self._pool is None and page_count <= pages_per_chunk:
+                return extract_pages_text(reader, 0, page_count)
 
-            return pages_text
+            # 모든 CPU 코어가 쓰이도록 범위 크기 조정 (설정값이 상한)
+            pages_per_chunk = max(
+                MIN_PAGES_PER_TASK,
+                min(
+                    pages_per_chunk,
+                    math.ceil(page_count / (os.cpu_count() or 1)),
+                ),
+            )
+
+            # 파일 경로는 그대로 넘겨 워커가 직접 읽도록 함 (PDF 바이트 전송 없음)
+            source = (
+                file_data
+                if isinstance(file_data, str)
+                else self._read_bytes(file_data)
+            )
+
+            # 페이지 범위별로 나누어 프로세스 풀에서 추출
+            return self._extract_in_parallel(
+                source, split_page_ranges(page_count, pages_per_chunk)
+            )
         except Exception as e:
-            print(f"PDF 처리 중 오류 발생: {e}")
+            logger.error("PDF 처리 중 오류 발생: %s", e)
             return []
 
+    def _extract_in_parallel(
+        self, source: Union[bytes, str], page_ranges: List[Tuple[int, int]]
+    ) -> List[Dict[str, Any]]:
+        """페이지 범위별 텍스트 추출을 프로세스 풀에서 실행"""
+        pool = self._pool
+        if pool is not None:
+            try:
+                return self._collect_pages(pool, source, page_ranges)
+            except BrokenProcessPool:
+                # 워커 하나가 죽으면(예: OOM) 풀 전체가 쓸 수 없게 되므로
+                # 새 풀로 교체한 뒤 한 번만 재시도
+                self._restart_pool(pool)
+                if self._pool is not None:
+                    return self._collect_pages(self._pool, source, page_ranges)
+
+        # 상주 풀이 없는 경우(스크립트 등) 임시 풀 사용
+        max_workers = min(len(page_ranges), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=get_context("spawn")
+        ) as pool:
+            return self._collect_pages(pool, source, page_ranges)
+
+    @staticmethod
+    def _collect_pages(
+        pool: ProcessPoolExecutor,
+        source: Union[bytes, str],
+        page_ranges: List[Tuple[int, int]],
+    ) -> List[Dict[str, Any]]:
+        """페이지 범위 작업을 제출하고 페이지 순서대로 결과 합치기"""
+        futures = [
+            pool.submit(extract_page_range, source, start, end)
+            for start, end in page_ranges
+        ]
+        return [page for future in futures for page in future.result()]
+
+    @staticmethod
+    def _read_bytes(file_data: Union[BinaryIO, io.BytesIO]) -> bytes:
+        """파일 객체에서 전체 바이트 읽기"""
+        if isinstance(file_data, io.BytesIO):
+            return file_data.getvalue()
+        file_data.seek(0)
+        return file_data.read()
+
     def create_chunks(
         self, pages_text: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
@@ -65,95 +185,221 @@ class PDFProcessor:
             page_chunks = self.text_splitter.split_text(text)
 
             for chunk_text in page_chunks:
-                if chunk_text.strip():
+                content = chunk_text.strip()
+                if content:
                     chunks.append(
                         {
+                            "id": uuid.uuid4(),
                             "chunk_index": chunk_index,
-                            "content": chunk_text.strip(),
+                            "content": content,
                             "page_number": page_number,
+                            # 반복되는 머리말/꼬리말 등은 해시로 임베딩 재사용
+                            "content_sha256": (
+                                embedding_cache_service.content_hash(content)
+                            ),
                         }
                     )
                     chunk_index += 1
 
         return chunks
 
+    def save_chunks(
+        self, db: Session, document_id: uuid.UUID, chunks: List[Dict[str, Any]]
+    ):
+        """청크를 데이터베이스에 저장 (대량일 경우 COPY 사용)"""
+        if len(chunks) > COPY_THRESHOLD:
+            bulk_copy(
+                db,
+                DocumentChunk.__table__,
+                CHUNK_COPY_COLUMNS,
+                (
+                    (
+                        chunk_data["id"],
+                        document_id,
+                        chunk_data["chunk_index"],
+                        chunk_data["content"],
+                        chunk_data["page_number"],
+                        chunk_data["content_sha256"],
+                    )
+                    for chunk_data in chunks
+                ),
+            )
+            return
+
+        if not chunks:
+            return
+
+        # 적은 수의 청크는 ORM 단위 작업 대신 한 번의 executemany INSERT
+        db.execute(
+            insert(DocumentChunk),
+            [
+                {
+                    "id": chunk_data["id"],
+                    "document_id": document_id,
+                    "chunk_index": chunk_data["chunk_index"],
+                    "content": chunk_data["content"],
+                    "page_number": chunk_data["page_number"],
+                    "content_sha256": chunk_data["content_sha256"],
+                }
+                for chunk_data in chunks
+            ],
+        )
+
     def process_pdf_from_storage(self, object_name: str, db: Session) -> str:
         """MinIO에서 PDF 다운로드 후 처리"""
         try:
-            # MinIO에서 파일 다운로드
-            file_data = storage_service.download_file(object_name)
-            if not file_data:
-                raise FileNotFoundError(
-                    f"MinIO에서 파일을 찾을 수 없습니다: {object_name}"
+            # 다운로드 전에 object name으로 레코드 선점
+            # (웹훅과 버킷 알림이 같은 파일을 동시에 받아도 한 번만 처리)
+            document_id = db.execute(
+                insert(Document)
+                .values(
+                    filename=object_name,
+                    file_path=f"minio://{storage_service.bucket_name}/{object_name}",
+                    object_name=object_name,
+                    status="processing",
                 )
-
-            # 파일 크기 계산
-            file_data.seek(0, 2)
-            file_size = file_data.tell()
-            file_data.seek(0)
-
-            # 문서 레코드 생성
-            document = Document(
-                filename=object_name,
-                file_path=f"minio://{storage_service.bucket_name}/{object_name}",
-                file_size=file_size,
-                status="processing",
-            )
-            db.add(document)
+                .on_conflict_do_nothing(index_elements=["object_name"])
+                .returning(Document.id)
+            ).scalar_one_or_none()
             db.commit()
-            db.refresh(document)
 
-            # PDF에서 텍스트 추출
-            pages_text = self.extract_text_from_pdf(file_data)
-            if not pages_text:
-                document.status = "error"
-                db.commit()
-                return str(document.id)
-
-            # 텍스트를 청크로 분할
-            chunks = self.create_chunks(pages_text)
-
-            # 청크를 데이터베이스에 저장
-            for chunk_data in chunks:
-                chunk = DocumentChunk(
-                    document_id=document.id,
-                    chunk_index=chunk_data["chunk_index"],
-                    content=chunk_data["content"],
-                    page_number=chunk_data["page_number"],
+            if document_id is None:
+                logger.info("이미 처리된 파일입니다: %s", object_name)
+                return str(
+                    db.scalar(
+                        select(Document.id).where(
+                            Document.object_name == object_name
+                        )
+                    )
                 )
-                db.add(chunk)
 
-            # 처리 완료 상태 업데이트
-            document.status = "completed"
-            db.commit()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # MinIO에서 임시 파일로 스트리밍 다운로드 (메모리에 올리지 않음)
+                file_path = os.path.join(temp_dir, Path(object_name).name)
+                if not storage_service.download_file_to_path(
+                    object_name, file_path
+                ):
+                    raise FileNotFoundError(
+                        f"MinIO에서 파일을 찾을 수 없습니다: {object_name}"
+                    )
 
-            return str(document.id)
+                document = db.get(Document, document_id)
+                document.file_size = os.path.getsize(file_path)
+
+                return self._process_document(document, file_path, db)
 
         except Exception as e:
-            print(f"PDF 처리 중 오류 발생: {e}")
+            logger.error("PDF 처리 중 오류 발생: %s", e)
+            # 실패한 트랜잭션을 되돌린 뒤 결과 기록
+            db.rollback()
             if "document" in locals():
-                document.status = "error"
+                self._mark_error(db, document)
+            elif locals().get("document_id") is not None:
+                # 다운로드 전 실패는 선점한 레코드 해제 (다음 알림이나 주기 확인에서 재시도)
+                db.execute(delete(Document).where(Document.id == document_id))
                 db.commit()
             raise e
 
+    @staticmethod
+    def _mark_error(db: Session, document: Document):
+        """문서를 오류 상태로 표시하고 내용 해시 선점 해제 (같은 파일 재업로드 허용)"""
+        document.status = "error"
+        document.content_sha256 = None
+        db.commit()
+
+    def _process_document(
+        self,
+        document: Document,
+        file_data: Union[str, BinaryIO],
+        db: Session,
+    ) -> str:
+        """문서 레코드에 대해 텍스트 추출, 청킹, 저장, 벡터화 수행"""
+        # PDF에서 텍스트 추출
+        pages_text = self.extract_text_from_pdf(file_data)
+        if not pages_text:
+            self._mark_error(db, document)
+            return str(document.id)
+
+        # 텍스트를 청크로 분할
+        chunks = self.create_chunks(pages_text)
+
+        # 청크를 데이터베이스에 저장
+        self.save_chunks(db, document.id, chunks)
+
+        # 메모리의 청크를 바로 임베딩하여 벡터 스토어에 추가 (DB 재조회 없음)
+        vector_store_service.add_chunks(db, document.id, chunks)
+
+        # 처리 완료 상태 업데이트
+        document.chunk_count = len(chunks)
+        document.status = "completed"
+        db.commit()
+
+        return str(document.id)
+
     def process_pdf_from_upload(
         self, file_data: BinaryIO, filename: str, db: Session
-    ) -> str:
-        """업로드된 파일을 MinIO에 저장 후 처리"""
+    ) -> Tuple[str, bool]:
+        """업로드된 파일을 MinIO에 저장 후 처리 (문서 ID, 신규 여부 반환)"""
         try:
             # 고유한 object name 생성
             file_extension = Path(filename).suffix
             object_name = f"{uuid.uuid4()}{file_extension}"
 
-            # MinIO에 파일 업로드
+            # 파일 크기와 내용 해시 계산
+            file_data.seek(0, 2)
+            file_size = file_data.tell()
+            file_data.seek(0)
+            content_sha256 = hashlib.file_digest(
+                file_data, "sha256"
+            ).hexdigest()
+            file_data.seek(0)
+
+            # 같은 내용의 문서가 없을 때만 레코드 선점 (동시 업로드에도 안전)
+            document_id = db.execute(
+                insert(Document)
+                .values(
+                    filename=filename,
+                    file_path=f"minio://{storage_service.bucket_name}/{object_name}",
+                    object_name=object_name,
+                    file_size=file_size,
+                    content_sha256=content_sha256,
+                    status="processing",
+                )
+                .on_conflict_do_nothing(index_elements=["content_sha256"])
+                .returning(Document.id)
+            ).scalar_one_or_none()
+            db.commit()
+
+            if document_id is None:
+                existing_id = db.scalar(
+                    select(Document.id).where(
+                        Document.content_sha256 == content_sha256
+                    )
+                )
+                return str(existing_id), False
+
+            # MinIO에 파일 업로드 (실패 시 선점한 레코드 해제)
             if not storage_service.upload_file(file_data, object_name):
+                db.execute(delete(Document).where(Document.id == document_id))
+                db.commit()
                 raise Exception("파일 업로드 실패")
 
-            # 업로드된 파일 처리
-            return self.process_pdf_from_storage(object_name, db)
+            document = db.get(Document, document_id)
+            if document is None:
+                # 업로드 중 다른 작업이 선점 레코드를 삭제한 경우
+                # 레코드 없이 남는 파일을 지우고 실패로 처리
+                storage_service.delete_file(object_name)
+                raise Exception(f"문서 레코드 선점을 잃었습니다: {object_name}")
+
+            # 업로드된 임시 파일에서 바로 처리 (MinIO 재다운로드 없음)
+            return self._process_document(document, file_data, db), True
 
         except Exception as e:
-            print(f"파일 업로드 및 처리 중 오류 발생: {e}")
+            logger.error("파일 업로드 및 처리 중 오류 발생: %s", e)
+            if locals().get("document") is not None:
+                # 실패한 트랜잭션을 되돌린 뒤 오류 상태 기록
+                db.rollback()
+                self._mark_error(db, document)
             raise e
 
 
@@ -2,15 +2,23 @@
 RAG (Retrieval-Augmented Generation) 서비스
 """
 
-from typing import Any, Dict, List
+import logging
+from typing import Any, Dict, Iterator, List, Optional
 
+import numpy as np
 import ollama
 from langchain.schema import Document as LangchainDocument
 
 from app.core.config import get_settings
+from app.services.embedding import embedding_service
 from app.services.vector_store import vector_store_service
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+GENERATION_ERROR_MESSAGE = (
+    "죄송합니다. 현재 응답을 생성할 수 없습니다. 나중에 다시 시도해주세요."
+)
 
 
 class RAGService:
@@ -19,17 +27,37 @@ class RAGService:
         self.model_name = settings.ollama_model
         self.vector_store = vector_store_service
 
+    def warmup(self):
+        """Ollama 모델을 미리 메모리에 올려 첫 질문의 로딩 지연 제거"""
+        try:
+            self.ollama_client.generate(
+                model=self.model_name,
+                prompt="warmup",
+                options={"num_predict": 1},
+            )
+            logger.info("Ollama 모델 워밍업 완료: %s", self.model_name)
+        except Exception as e:
+            logger.warning("Ollama 모델 워밍업 실패: %s", e)
+
     def retrieve_relevant_documents(
-        self, query: str, k: int = 5
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> List[LangchainDocument]:
-        """관련 문서 검색"""
+        """관련 문서 검색 (이미 계산된 질의 임베딩이 있으면 재사용)"""
         try:
+            if query_embedding is None:
+                query_embedding = embedding_service.embed_query_np(query)
+
             # 벡터 스토어에서 유사도 검색
-            relevant_docs = self.vector_store.similarity_search(query, k=k)
+            relevant_docs = self.vector_store.similarity_search_by_vector(
+                query_embedding, k=k
+            )
             return relevant_docs
 
         except Exception as e:
-            print(f"문서 검색 중 오류 발생: {e}")
+            logger.error("문서 검색 중 오류 발생: %s", e)
             return []
 
     def generate_context(self, documents: List[LangchainDocument]) -> str:
@@ -37,15 +65,14 @@ class RAGService:
         context_parts = []
 
         for i, doc in enumerate(documents, 1):
-            content = doc.page_content
-            metadata = doc.metadata
+            page_number = doc.metadata.get("page_number")
 
-            context_part = f"[문서 {i}]\n"
-            if metadata.get("page_number"):
-                context_part += f"(페이지 {metadata['page_number']})\n"
-            context_part += f"{content}\n\n"
-
-            context_parts.append(context_part)
+            # 문자열을 이어 붙이지 않고 조각을 모아 마지막에 한 번만 join
+            context_parts.append(f"[문서 {i}]\n")
+            if page_number:
+                context_parts.append(f"(페이지 {page_number})\n")
+            context_parts.append(doc.page_content)
+            context_parts.append("\n\n")
 
         return "".join(context_parts)
 
@@ -61,31 +88,92 @@ class RAGService:
 답변:"""
         return prompt
 
+    @staticmethod
+    def _chat_options() -> Optional[Dict[str, Any]]:
+        """Ollama 추론 옵션 (설정된 값만 전달)"""
+        options = {}
+        if settings.ollama_num_ctx:
+            options["num_ctx"] = settings.ollama_num_ctx
+        if settings.ollama_num_thread:
+            options["num_thread"] = settings.ollama_num_thread
+        return options or None
+
+    def _chat(self, prompt: str) -> str:
+        """Ollama를 사용한 응답 생성 (오류는 호출자에게 전파)"""
+        response = self.ollama_client.chat(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            options=self._chat_options(),
+        )
+        return response["message"]["content"]
+
     def generate_response(self, prompt: str) -> str:
         """Ollama를 사용한 응답 생성"""
         try:
-            response = self.ollama_client.chat(
+            return self._chat(prompt)
+
+        except Exception as e:
+            logger.error("Ollama 응답 생성 중 오류 발생: %s", e)
+            return GENERATION_ERROR_MESSAGE
+
+    def generate_response_stream(self, prompt: str) -> Iterator[str]:
+        """Ollama 응답을 생성되는 대로 토큰 단위로 반환"""
+        try:
+            # 제너레이터가 중간에 닫히면(클라이언트 연결 종료) 스트림도 닫혀
+            # Ollama가 남은 토큰을 생성하지 않음
+            for part in self.ollama_client.chat(
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
-            )
-
-            return response["message"]["content"]
+                options=self._chat_options(),
+                stream=True,
+            ):
+                yield part["message"]["content"]
 
         except Exception as e:
-            print(f"Ollama 응답 생성 중 오류 발생: {e}")
-            return "죄송합니다. 현재 응답을 생성할 수 없습니다. 나중에 다시 시도해주세요."
-
-    def answer_question(self, query: str, k: int = 5) -> Dict[str, Any]:
-        """RAG 파이프라인 - 질문에 대한 답변 생성"""
+            logger.error("Ollama 스트리밍 응답 생성 중 오류 발생: %s", e)
+            yield GENERATION_ERROR_MESSAGE
+
+    def build_sources(
+        self, documents: List[LangchainDocument]
+    ) -> List[Dict[str, Any]]:
+        """검색된 문서들의 출처 정보 생성"""
+        sources = []
+        for doc in documents:
+            metadata = doc.metadata
+            source_info = {
+                "chunk_id": metadata.get("chunk_id"),
+                "document_id": metadata.get("document_id"),
+                "page_number": metadata.get("page_number"),
+                "content_preview": doc.page_content[:200] + "..."
+                if len(doc.page_content) > 200
+                else doc.page_content,
+            }
+            sources.append(source_info)
+        return sources
+
+    def answer_question(
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """
+        RAG 파이프라인 - 질문에 대한 답변 생성
+
+        답변 생성에 실패하면 안내 문구와 함께 "error": True를 반환합니다.
+        """
         try:
             # 1. 관련 문서 검색
-            relevant_docs = self.retrieve_relevant_documents(query, k=k)
+            relevant_docs = self.retrieve_relevant_documents(
+                query, k=k, query_embedding=query_embedding
+            )
 
             if not relevant_docs:
                 return {
                     "answer": "관련된 문서를 찾을 수 없습니다. 다른 질문을 시도해보세요.",
                     "sources": [],
                     "context": "",
+                    "error": False,
                 }
 
             # 2. 컨텍스트 생성
@@ -94,33 +182,64 @@ class RAGService:
             # 3. 프롬프트 생성
             prompt = self.create_prompt(query, context)
 
-            # 4. 응답 생성
-            answer = self.generate_response(prompt)
+            # 4. 응답 생성 (실패 시 호출자가 캐시하지 않도록 표시)
+            error = False
+            try:
+                answer = self._chat(prompt)
+            except Exception as e:
+                logger.error("Ollama 응답 생성 중 오류 발생: %s", e)
+                answer = GENERATION_ERROR_MESSAGE
+                error = True
 
             # 5. 소스 정보 준비
-            sources = []
-            for doc in relevant_docs:
-                metadata = doc.metadata
-                source_info = {
-                    "chunk_id": metadata.get("chunk_id"),
-                    "document_id": metadata.get("document_id"),
-                    "page_number": metadata.get("page_number"),
-                    "content_preview": doc.page_content[:200] + "..."
-                    if len(doc.page_content) > 200
-                    else doc.page_content,
-                }
-                sources.append(source_info)
+            sources = self.build_sources(relevant_docs)
 
-            return {"answer": answer, "sources": sources, "context": context}
+            return {
+                "answer": answer,
+                "sources": sources,
+                "context": context,
+                "error": error,
+            }
 
         except Exception as e:
-            print(f"RAG 질문 답변 중 오류 발생: {e}")
+            logger.error("RAG 질문 답변 중 오류 발생: %s", e)
             return {
                 "answer": "죄송합니다. 질문 처리 중 오류가 발생했습니다.",
                 "sources": [],
                 "context": "",
+                "error": True,
             }
 
+    def answer_question_stream(
+        self,
+        query: str,
+        k: int = 5,
+        query_embedding: Optional[np.ndarray] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """RAG 파이프라인 (스트리밍) - 출처를 먼저 보내고 답변 토큰을 이어서 반환"""
+        try:
+            relevant_docs = self.retrieve_relevant_documents(
+                query, k=k, query_embedding=query_embedding
+            )
+
+            if not relevant_docs:
+                yield {"sources": []}
+                yield {
+                    "token": "관련된 문서를 찾을 수 없습니다. 다른 질문을 시도해보세요."
+                }
+                return
+
+            yield {"sources": self.build_sources(relevant_docs)}
+
+            context = self.generate_context(relevant_docs)
+            prompt = self.create_prompt(query, context)
+            for token in self.generate_response_stream(prompt):
+                yield {"token": token}
+
+        except Exception as e:
+            logger.error("RAG 스트리밍 답변 중 오류 발생: %s", e)
+            yield {"token": "죄송합니다. 질문 처리 중 오류가 발생했습니다."}
+
 
 # 전역 RAG 서비스 인스턴스
 rag_service = RAGService()
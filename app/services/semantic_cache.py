@@ -0,0 +1,85 @@
+"""
+질의 임베딩 기반 시맨틱 캐시 서비스
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class SemanticCache:
+    def __init__(self, max_size: int = 10000, threshold: float = 0.97):
+        self.max_size = max_size
+        self.threshold = threshold
+        # 슬롯 번호 -> RAG 응답 (조회 순서로 LRU 관리)
+        self._responses: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        # 정규화된 질의 임베딩 행렬 (첫 저장 시 차원에 맞춰 생성)
+        self._matrix: Optional[np.ndarray] = None
+        # 슬롯별 검색 문서 수 (k가 다른 요청의 답변은 재사용하지 않음)
+        self._ks = np.zeros(max_size, dtype=np.int64)
+        self._used_slots = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """코사인 유사도를 내적으로 계산할 수 있도록 정규화"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, query_embedding, k: int) -> Optional[Dict[str, Any]]:
+        """같은 k로 유사한 질의가 캐시되어 있으면 응답 반환"""
+        vector = self._normalize(query_embedding)
+
+        with self._lock:
+            if not self._responses:
+                return None
+
+            scores = self._matrix[: self._used_slots] @ vector
+            scores[self._ks[: self._used_slots] != k] = -np.inf
+            slot = int(np.argmax(scores))
+            if scores[slot] < self.threshold or slot not in self._responses:
+                return None
+
+            self._responses.move_to_end(slot)
+            return self._responses[slot]
+
+    def put(self, query_embedding, k: int, response: Dict[str, Any]):
+        """질의 임베딩과 검색 문서 수(k)별로 응답을 캐시에 저장"""
+        vector = self._normalize(query_embedding)
+
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros(
+                    (self.max_size, vector.shape[0]), dtype=np.float32
+                )
+
+            if self._used_slots < self.max_size:
+                slot = self._used_slots
+                self._used_slots += 1
+            else:
+                # 용량 초과 시 가장 오래 사용되지 않은 항목의 슬롯 재사용
+                slot, _ = self._responses.popitem(last=False)
+
+            self._matrix[slot] = vector
+            self._ks[slot] = k
+            self._responses[slot] = response
+
+    def clear(self):
+        """캐시 초기화 (문서 변경 시 호출)"""
+        with self._lock:
+            self._responses.clear()
+            self._used_slots = 0
+
+
+# 전역 시맨틱 캐시 인스턴스
+semantic_cache = SemanticCache(
+    max_size=settings.semantic_cache_size,
+    threshold=settings.semantic_cache_threshold,
+)
@@ -3,16 +3,21 @@ MinIO 기반 파일 저장 서비스
 """
 
 import io
+import logging
 import os
-from typing import BinaryIO, Optional
+from datetime import timedelta
+from typing import BinaryIO, Iterator, Optional
 from urllib.parse import urlparse
 
+import certifi
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 
 from app.core.config import get_settings
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 
 class StorageService:
@@ -39,19 +44,41 @@ class StorageService:
             access_key=minio_access_key,
             secret_key=minio_secret_key,
             secure=secure,
+            http_client=self._create_http_client(),
         )
 
         # 버킷 생성 (존재하지 않는 경우)
         self._ensure_bucket_exists()
 
+    @staticmethod
+    def _create_http_client() -> urllib3.PoolManager:
+        """동시 요청에도 연결을 재사용하도록 풀 크기를 늘린 HTTP 클라이언트
+
+        MinIO 기본값(maxsize=10)을 넘는 동시 요청은 연결을 새로 맺고 버리므로
+        파일 감시, 정리, 업로드가 겹칠 때 TCP/TLS 핸드셰이크가 반복됨
+        """
+        timeout = timedelta(minutes=5).seconds
+        return urllib3.PoolManager(
+            timeout=urllib3.Timeout(connect=timeout, read=timeout),
+            maxsize=settings.minio_pool_size,
+            block=False,
+            cert_reqs="CERT_REQUIRED",
+            ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+            retries=urllib3.Retry(
+                total=5,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
+
     def _ensure_bucket_exists(self):
         """버킷이 존재하지 않으면 생성"""
         try:
             if not self.client.bucket_exists(self.bucket_name):
                 self.client.make_bucket(self.bucket_name)
-                print(f"버킷 '{self.bucket_name}' 생성 완료")
+                logger.info("버킷 '%s' 생성 완료", self.bucket_name)
         except S3Error as e:
-            print(f"버킷 확인/생성 중 오류 발생: {e}")
+            logger.error("버킷 확인/생성 중 오류 발생: %s", e)
 
     def upload_file(
         self,
@@ -73,11 +100,11 @@ class StorageService:
                 length=file_size,
                 content_type=content_type,
             )
-            print(f"파일 '{object_name}' 업로드 완료")
+            logger.info("파일 '%s' 업로드 완료", object_name)
             return True
 
         except S3Error as e:
-            print(f"파일 업로드 중 오류 발생: {e}")
+            logger.error("파일 업로드 중 오류 발생: %s", e)
             return False
 
     def upload_file_from_path(
@@ -94,11 +121,11 @@ class StorageService:
                 file_path=file_path,
                 content_type="application/pdf",
             )
-            print(f"파일 '{file_path}' -> '{object_name}' 업로드 완료")
+            logger.info("파일 '%s' -> '%s' 업로드 완료", file_path, object_name)
             return True
 
         except S3Error as e:
-            print(f"파일 업로드 중 오류 발생: {e}")
+            logger.error("파일 업로드 중 오류 발생: %s", e)
             return False
 
     def download_file(self, object_name: str) -> Optional[io.BytesIO]:
@@ -111,7 +138,7 @@ class StorageService:
             return file_data
 
         except S3Error as e:
-            print(f"파일 다운로드 중 오류 발생: {e}")
+            logger.error("파일 다운로드 중 오류 발생: %s", e)
             return None
 
     def download_file_to_path(self, object_name: str, file_path: str) -> bool:
@@ -122,11 +149,13 @@ class StorageService:
                 object_name=object_name,
                 file_path=file_path,
             )
-            print(f"파일 '{object_name}' -> '{file_path}' 다운로드 완료")
+            logger.info(
+                "파일 '%s' -> '%s' 다운로드 완료", object_name, file_path
+            )
             return True
 
         except S3Error as e:
-            print(f"파일 다운로드 중 오류 발생: {e}")
+            logger.error("파일 다운로드 중 오류 발생: %s", e)
             return False
 
     def get_file_url(
@@ -142,18 +171,18 @@ class StorageService:
             return url
 
         except S3Error as e:
-            print(f"URL 생성 중 오류 발생: {e}")
+            logger.error("URL 생성 중 오류 발생: %s", e)
             return None
 
     def delete_file(self, object_name: str) -> bool:
         """파일 삭제"""
         try:
             self.client.remove_object(self.bucket_name, object_name)
-            print(f"파일 '{object_name}' 삭제 완료")
+            logger.info("파일 '%s' 삭제 완료", object_name)
             return True
 
         except S3Error as e:
-            print(f"파일 삭제 중 오류 발생: {e}")
+            logger.error("파일 삭제 중 오류 발생: %s", e)
             return False
 
     def file_exists(self, object_name: str) -> bool:
@@ -164,16 +193,23 @@ class StorageService:
         except S3Error:
             return False
 
-    def list_files(self, prefix: str = "") -> list:
-        """파일 목록 조회"""
+    def iter_files(self, prefix: str = "", suffix: str = "") -> Iterator[str]:
+        """파일 이름을 페이지 단위로 받아오면서 하나씩 반환 (오류는 전파)"""
+        objects = self.client.list_objects(
+            bucket_name=self.bucket_name, prefix=prefix, recursive=True
+        )
+        # 목록 조회 결과를 순회하면서 바로 필터링 (중간 리스트 없음)
+        for obj in objects:
+            if obj.object_name.endswith(suffix):
+                yield obj.object_name
+
+    def list_files(self, prefix: str = "", suffix: str = "") -> list:
+        """파일 목록 조회 (suffix가 주어지면 해당 확장자만)"""
         try:
-            objects = self.client.list_objects(
-                bucket_name=self.bucket_name, prefix=prefix, recursive=True
-            )
-            return [obj.object_name for obj in objects]
+            return list(self.iter_files(prefix, suffix))
 
         except S3Error as e:
-            print(f"파일 목록 조회 중 오류 발생: {e}")
+            logger.error("파일 목록 조회 중 오류 발생: %s", e)
             return []
 
 
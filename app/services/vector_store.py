@@ -2,17 +2,31 @@
 Langchain PostgreSQL Vector Store 서비스
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from langchain.schema import Document as LangchainDocument
 from langchain_postgres.vectorstores import PGVector
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import bindparam, create_engine, event, text
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.models.documents import DocumentChunk
+from app.db.database import engine_options
 from app.services.embedding import embedding_service
+from app.services.embedding_cache import embedding_cache_service
+from app.services.semantic_cache import semantic_cache
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# HNSW 인덱스 설정 (halfvec 사용, pgvector >= 0.7.0)
+HNSW_INDEX_NAME = "ix_langchain_pg_embedding_hnsw_halfvec"
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
 
 
 class VectorStoreService:
@@ -21,50 +35,175 @@ class VectorStoreService:
         self.connection_string = settings.database_url
         self.collection_name = "document_embeddings"
         self.embedding_function = embedding_service
+        self.dimension = embedding_service.get_dimension()
+
+        # 벡터 스토어 전용 엔진 (연결마다 HNSW 검색 파라미터 설정)
+        self.engine = create_engine(self.connection_string, **engine_options())
+        event.listen(self.engine, "connect", self._configure_connection)
 
         # PGVector 인스턴스 생성 (새로운 API)
         self.vector_store = PGVector(
             embeddings=self.embedding_function,
-            connection=self.connection_string,
+            connection=self.engine,
+            embedding_length=self.dimension,
             collection_name=self.collection_name,
         )
 
-    def add_document_chunks(self, db: Session, document_id: str):
-        """문서 청크들을 벡터 스토어에 추가"""
+    @staticmethod
+    def _configure_connection(dbapi_connection, connection_record):
+        """새 DB 연결에 HNSW 검색 파라미터 설정"""
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute(
+                f"SET hnsw.ef_search = {int(settings.hnsw_ef_search)}"
+            )
+        dbapi_connection.commit()
+
+    def _halfvec_expression(self, column: str) -> str:
+        """fp16(halfvec)으로 변환한 임베딩 표현식 (인덱스와 검색에서 동일하게 사용)"""
+        return f"(CAST({column} AS halfvec({self.dimension})))"
+
+    def ensure_hnsw_index(self):
+        """
+        halfvec HNSW 인덱스가 없으면 생성 (앱 시작 시 호출)
+
+        기존 DB는 Alembic 마이그레이션이 인덱스를 만들고, 여기서는 마이그레이션
+        시점에 임베딩 테이블이 없던 새 설치만 처리합니다.
+        """
+        table_name = self.vector_store.EmbeddingStore.__tablename__
+
         try:
-            # 문서 청크 조회
-            chunks = (
-                db.query(DocumentChunk)
-                .filter(DocumentChunk.document_id == document_id)
-                .all()
+            # CONCURRENTLY는 트랜잭션 밖에서만 실행 가능
+            with self.engine.connect().execution_options(
+                isolation_level="AUTOCOMMIT"
+            ) as conn:
+                # 카탈로그만 조회하므로 인덱스가 있으면 잠금 없이 종료
+                is_valid = conn.scalar(
+                    text(
+                        "SELECT i.indisvalid FROM pg_index AS i "
+                        "WHERE i.indexrelid = to_regclass(:index_name)"
+                    ),
+                    {"index_name": HNSW_INDEX_NAME},
+                )
+                if is_valid:
+                    return
+
+                # 실패한 빌드로 INVALID 상태인 인덱스는 다시 생성
+                if is_valid is False:
+                    conn.execute(
+                        text(
+                            "DROP INDEX CONCURRENTLY IF EXISTS "
+                            f"{HNSW_INDEX_NAME}"
+                        )
+                    )
+
+                logger.info("HNSW 인덱스 생성: %s", HNSW_INDEX_NAME)
+                conn.execute(
+                    text(
+                        "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+                        f"{HNSW_INDEX_NAME} ON {table_name} USING hnsw "
+                        f"({self._halfvec_expression('embedding')} "
+                        "halfvec_cosine_ops) "
+                        f"WITH (m = {HNSW_M}, "
+                        f"ef_construction = {HNSW_EF_CONSTRUCTION})"
+                    )
+                )
+        except Exception as e:
+            logger.error("HNSW 인덱스 확인/생성 중 오류 발생: %s", e)
+
+    def _search_by_vector(
+        self, embedding: np.ndarray, k: int
+    ) -> List[Tuple[LangchainDocument, float]]:
+        """halfvec HNSW 인덱스를 사용한 코사인 거리 검색"""
+        embedding_table = self.vector_store.EmbeddingStore.__tablename__
+        collection_table = self.vector_store.CollectionStore.__tablename__
+        distance = (
+            f"{self._halfvec_expression('e.embedding')} "
+            f"<=> {self._halfvec_expression(':embedding')}"
+        )
+
+        query = text(
+            f"SELECT e.document, e.cmetadata, {distance} AS distance "
+            f"FROM {embedding_table} AS e "
+            "WHERE e.collection_id = ("
+            f"SELECT uuid FROM {collection_table} WHERE name = :collection_name"
+            ") "
+            f"ORDER BY {distance} "
+            "LIMIT :k"
+        ).bindparams(bindparam("embedding", type_=Vector(self.dimension)))
+
+        with self.engine.connect() as conn:
+            # 후보 수(ef_search)가 k보다 작으면 결과가 k개보다 적게 나오므로
+            # 이 트랜잭션에서만 후보 수를 늘림 (기본값은 연결 생성 시 설정)
+            if k > settings.hnsw_ef_search:
+                conn.execute(
+                    text(
+                        "SELECT set_config('hnsw.ef_search', :ef_search, true)"
+                    ),
+                    {"ef_search": str(k)},
+                )
+
+            rows = conn.execute(
+                query,
+                {
+                    "embedding": embedding,
+                    "collection_name": self.collection_name,
+                    "k": k,
+                },
+            ).all()
+
+        return [
+            (
+                LangchainDocument(
+                    page_content=row.document, metadata=row.cmetadata or {}
+                ),
+                row.distance,
             )
+            for row in rows
+        ]
 
+    def add_chunks(
+        self,
+        db: Session,
+        document_id: uuid.UUID,
+        chunks: List[Dict[str, Any]],
+    ):
+        """청킹 직후의 청크들을 임베딩하여 벡터 스토어에 추가"""
+        try:
             if not chunks:
-                print(f"문서 ID {document_id}에 대한 청크를 찾을 수 없습니다.")
+                logger.info("문서 ID %s에 추가할 청크가 없습니다.", document_id)
                 return
 
-            # Langchain Document 객체로 변환
-            documents = []
-            for chunk in chunks:
-                doc = LangchainDocument(
-                    page_content=chunk.content,
-                    metadata={
-                        "chunk_id": str(chunk.id),
-                        "document_id": str(chunk.document_id),
-                        "chunk_index": chunk.chunk_index,
-                        "page_number": chunk.page_number,
-                    },
-                )
-                documents.append(doc)
+            texts = [chunk["content"] for chunk in chunks]
+            metadatas = [
+                {
+                    "chunk_id": str(chunk["id"]),
+                    "document_id": str(document_id),
+                    "chunk_index": chunk["chunk_index"],
+                    "page_number": chunk["page_number"],
+                }
+                for chunk in chunks
+            ]
+
+            # 문서의 모든 청크를 한 번에 임베딩 (캐시 미스만 배치 처리)
+            embeddings = embedding_cache_service.embed_documents(
+                db, texts, [chunk["content_sha256"] for chunk in chunks]
+            )
 
             # 벡터 스토어에 추가
-            self.vector_store.add_documents(documents)
-            print(
-                f"문서 ID {document_id}의 {len(documents)}개 청크를 벡터 스토어에 추가했습니다."
+            self.vector_store.add_embeddings(
+                texts=texts, embeddings=embeddings, metadatas=metadatas
+            )
+
+            # 검색 대상이 바뀌었으므로 캐시된 답변 무효화
+            semantic_cache.clear()
+            logger.info(
+                "문서 ID %s의 %s개 청크를 벡터 스토어에 추가했습니다.",
+                document_id,
+                len(texts),
             )
 
         except Exception as e:
-            print(f"벡터 스토어에 청크 추가 중 오류 발생: {e}")
+            logger.error("벡터 스토어에 청크 추가 중 오류 발생: %s", e)
             raise e
 
     def similarity_search(
@@ -80,12 +219,26 @@ class VectorStoreService:
                     query, k=k, filter=filter_dict
                 )
             else:
-                results = self.vector_store.similarity_search(query, k=k)
+                embedding = self.embedding_function.embed_query_np(query)
+                results = [
+                    doc for doc, _ in self._search_by_vector(embedding, k)
+                ]
 
             return results
 
         except Exception as e:
-            print(f"유사도 검색 중 오류 발생: {e}")
+            logger.error("유사도 검색 중 오류 발생: %s", e)
+            return []
+
+    def similarity_search_by_vector(
+        self, embedding: np.ndarray, k: int = 5
+    ) -> List[LangchainDocument]:
+        """미리 계산한 질의 임베딩으로 유사도 검색"""
+        try:
+            return [doc for doc, _ in self._search_by_vector(embedding, k)]
+
+        except Exception as e:
+            logger.error("유사도 검색 중 오류 발생: %s", e)
             return []
 
     def similarity_search_with_score(
@@ -101,28 +254,60 @@ class VectorStoreService:
                     query, k=k, filter=filter_dict
                 )
             else:
-                results = self.vector_store.similarity_search_with_score(
-                    query, k=k
-                )
+                embedding = self.embedding_function.embed_query_np(query)
+                results = self._search_by_vector(embedding, k)
 
             return results
 
         except Exception as e:
-            print(f"유사도 검색 중 오류 발생: {e}")
+            logger.error("유사도 검색 중 오류 발생: %s", e)
             return []
 
-    def delete_document(self, document_id: str):
-        """문서 삭제 (벡터 스토어에서)"""
+    def delete_documents(self, document_ids: List[str]) -> int:
+        """여러 문서의 임베딩을 한 번의 DELETE로 삭제"""
+        if not document_ids:
+            return 0
+
+        embedding_table = self.vector_store.EmbeddingStore.__tablename__
+        collection_table = self.vector_store.CollectionStore.__tablename__
+        query = text(
+            f"DELETE FROM {embedding_table} "
+            "WHERE collection_id = ("
+            f"SELECT uuid FROM {collection_table} WHERE name = :collection_name"
+            ") "
+            "AND cmetadata->>'document_id' = ANY(:document_ids)"
+        )
+
         try:
-            # 메타데이터로 필터링하여 삭제
-            filter_dict = {"document_id": document_id}
-            self.vector_store.delete(filter=filter_dict)
-            print(f"문서 ID {document_id}를 벡터 스토어에서 삭제했습니다.")
+            with self.engine.begin() as conn:
+                result = conn.execute(
+                    query,
+                    {
+                        "collection_name": self.collection_name,
+                        "document_ids": [str(i) for i in document_ids],
+                    },
+                )
+
+            semantic_cache.clear()
+            logger.info(
+                "%s개 문서의 임베딩 %s개를 벡터 스토어에서 삭제했습니다.",
+                len(document_ids),
+                result.rowcount,
+            )
+            return result.rowcount
 
         except Exception as e:
-            print(f"벡터 스토어에서 문서 삭제 중 오류 발생: {e}")
+            logger.error("벡터 스토어에서 문서 삭제 중 오류 발생: %s", e)
             raise e
 
+    async def adelete_documents(self, document_ids: List[str]) -> int:
+        """delete_documents의 비동기 버전 (다른 I/O와 동시에 대기 가능)"""
+        return await asyncio.to_thread(self.delete_documents, document_ids)
+
+    def delete_document(self, document_id: str):
+        """문서 삭제 (벡터 스토어에서)"""
+        self.delete_documents([document_id])
+
 
 # 전역 벡터 스토어 서비스 인스턴스
 vector_store_service = VectorStoreService()
@@ -0,0 +1,46 @@
+"""
+간단한 TTL 캐시 유틸리티
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """만료되지 않은 값 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: str, value: Any):
+        """값 저장"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self):
+        """모든 값 삭제 (데이터 변경 시 호출)"""
+        with self._lock:
+            self._entries.clear()
+
+
+# MinIO/DB 상태 조회 결과용 전역 캐시 인스턴스
+status_cache = TTLCache(ttl_seconds=settings.status_cache_ttl)
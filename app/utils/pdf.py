@@ -0,0 +1,44 @@
+"""
+PDF 텍스트 추출 유틸리티 (프로세스 풀 작업 함수)
+
+자식 프로세스에서 import되므로 무거운 서비스 모듈을 import하지 않습니다.
+"""
+
+import io
+from typing import Any, Dict, List, Tuple, Union
+
+from pypdf import PdfReader
+
+
+def extract_pages_text(
+    reader: PdfReader, start: int, end: int
+) -> List[Dict[str, Any]]:
+    """페이지 범위 [start, end)의 텍스트 추출"""
+    pages_text = []
+
+    for page_index in range(start, end):
+        text = reader.pages[page_index].extract_text()
+        if text.strip():
+            pages_text.append(
+                {"page_number": page_index + 1, "text": text.strip()}
+            )
+
+    return pages_text
+
+
+def extract_page_range(
+    source: Union[bytes, str], start: int, end: int
+) -> List[Dict[str, Any]]:
+    """PDF 바이트 또는 파일 경로에서 페이지 범위의 텍스트 추출"""
+    stream = source if isinstance(source, str) else io.BytesIO(source)
+    return extract_pages_text(PdfReader(stream), start, end)
+
+
+def split_page_ranges(
+    page_count: int, pages_per_chunk: int
+) -> List[Tuple[int, int]]:
+    """전체 페이지를 pages_per_chunk 단위의 범위로 분할"""
+    return [
+        (start, min(start + pages_per_chunk, page_count))
+        for start in range(0, page_count, pages_per_chunk)
+    ]
@@ -3,9 +3,24 @@
 MinIO에 없는 파일들의 DB 데이터 정리 스크립트
 """
 
+import argparse
+import asyncio
+import logging
 import os
 import sys
-
+import time
+from functools import lru_cache
+from typing import FrozenSet
+
+from sqlalchemy import (
+    String,
+    column,
+    delete,
+    exists,
+    func,
+    select,
+    table,
+)
 from sqlalchemy.orm import Session
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
@@ -16,50 +31,84 @@ from app.models.documents import Document, DocumentChunk
 from app.services.storage import storage_service
 from app.services.vector_store import vector_store_service
 
+logger = logging.getLogger(__name__)
+
+# anti-join용 MinIO 파일명 임시 테이블 (트랜잭션이 끝나면 자동 삭제)
+tmp_minio = table("tmp_minio", column("name", String))
+
+# 상태 확인을 반복할 때 같은 목록을 다시 조회하지 않도록 재사용하는 시간 (초)
+MINIO_LIST_TTL = 30
+
+
+@lru_cache(maxsize=1)
+def _list_minio_pdf_files(ttl_bucket: int) -> FrozenSet[str]:
+    """MinIO PDF 파일 목록 (ttl_bucket이 같으면 캐시된 결과 반환)"""
+    # 목록을 받아오면서 바로 집합에 추가 (조회 오류는 캐시하지 않고 전파)
+    return frozenset(storage_service.iter_files(suffix=".pdf"))
+
+
+def list_minio_pdf_files() -> FrozenSet[str]:
+    """최근 MINIO_LIST_TTL초 이내에 조회한 MinIO PDF 파일 목록"""
+    return _list_minio_pdf_files(int(time.time() // MINIO_LIST_TTL))
+
 
 def get_minio_files():
     """MinIO에서 PDF 파일 목록 조회"""
-    print("\n1. MinIO 파일 목록 조회 중...")
+    logger.info("\n1. MinIO 파일 목록 조회 중...")
     try:
-        minio_files = storage_service.list_files()
-        minio_pdf_files = set(f for f in minio_files if f.endswith(".pdf"))
-        print(f"   MinIO에 있는 PDF 파일: {len(minio_pdf_files)}개")
-        if minio_pdf_files:
+        # 정리는 삭제 작업이므로 캐시된 목록을 쓰지 않고 항상 새로 조회
+        # (그 사이 업로드된 파일이 orphaned로 잘못 분류되지 않도록)
+        _list_minio_pdf_files.cache_clear()
+        # 조회 오류 시 정리하지 않음
+        minio_pdf_files = list_minio_pdf_files()
+        logger.info("   MinIO에 있는 PDF 파일: %s개", len(minio_pdf_files))
+        if not minio_pdf_files:
+            logger.info("   - MinIO에 PDF 파일이 없습니다.")
+        elif logger.isEnabledFor(logging.DEBUG):
             for file in minio_pdf_files:
-                print(f"   - {file}")
-        else:
-            print("   - MinIO에 PDF 파일이 없습니다.")
+                logger.debug("   - %s", file)
         return minio_pdf_files
     except Exception as e:
-        print(f"   ❌ MinIO 연결 오류: {e}")
+        logger.error("   ❌ MinIO 연결 오류: %s", e)
         return None
 
 
-def get_db_documents(db: Session):
-    """DB에서 문서 목록 조회"""
-    print("\n2. DB 문서 목록 조회 중...")
-    db_documents = db.query(Document).all()
-    print(f"   DB에 있는 문서: {len(db_documents)}개")
-    return db_documents
-
-
-def find_orphaned_documents(db_documents, minio_pdf_files):
-    """orphaned 문서 찾기"""
-    print("\n3. 정리 대상 문서 찾기...")
-    orphaned_docs = []
-
-    for doc in db_documents:
-        # file_path에서 파일명 추출
-        if doc.file_path.startswith("minio://"):
-            # minio://bucket_name/filename.pdf -> filename.pdf
-            file_name = doc.file_path.split("/")[-1]
-        else:
-            file_name = doc.filename
-
-        # MinIO에 파일이 없으면 orphaned
-        if file_name not in minio_pdf_files:
-            orphaned_docs.append(doc)
-            print(f"   🗑️  정리 대상: {doc.filename} (ID: {doc.id})")
+def count_db_documents(db: Session) -> int:
+    """DB 문서 수 조회"""
+    logger.info("\n2. DB 문서 수 조회 중...")
+    document_count = db.scalar(select(func.count()).select_from(Document))
+    logger.info("   DB에 있는 문서: %s개", document_count)
+    return document_count
+
+
+def find_orphaned_documents(db: Session, minio_pdf_files: FrozenSet[str]):
+    """orphaned 문서 찾기 (DB에서 anti-join으로 정리 대상만 조회)"""
+    logger.info("\n3. 정리 대상 문서 찾기...")
+
+    # MinIO 파일 목록은 COPY로 임시 테이블에 한 번에 적재
+    # (세션과 같은 트랜잭션에서 생성되어 세션이 끝나면 함께 삭제됨)
+    with db.connection().connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TEMP TABLE tmp_minio (name text PRIMARY KEY) ON COMMIT DROP"
+        )
+        with cursor.copy("COPY tmp_minio (name) FROM STDIN") as copy:
+            for name in minio_pdf_files:
+                copy.write_row((name,))
+        # 통계가 있어야 플래너가 해시 anti-join을 선택
+        cursor.execute("ANALYZE tmp_minio")
+
+    # 문서의 object key(하위 경로 포함)가 MinIO에 없으면 orphaned
+    # (처리 중인 문서는 업로드 전에 레코드를 먼저 만들므로 제외)
+    orphaned_docs = db.execute(
+        select(Document.id, Document.filename).where(
+            Document.status.is_distinct_from("processing"),
+            ~exists().where(tmp_minio.c.name == Document.object_name),
+        )
+    ).all()
+
+    if logger.isEnabledFor(logging.DEBUG):
+        for doc in orphaned_docs:
+            logger.debug("   🗑️  정리 대상: %s (ID: %s)", doc.filename, doc.id)
 
     return orphaned_docs
 
@@ -72,152 +121,219 @@ def confirm_cleanup(orphaned_docs):
     return confirm == "y"
 
 
-def delete_single_document(db: Session, doc):
-    """단일 문서 삭제 처리"""
-    document_id = str(doc.id)
-    print(f"   정리 중: {doc.filename} (ID: {document_id})")
-
-    # 벡터 스토어에서 삭제
+async def delete_vectors(orphaned_docs) -> bool:
+    """벡터 스토어에서 문서 임베딩을 한 번에 삭제 (실패 시 문서별 재시도)"""
+    orphan_ids = [str(doc.id) for doc in orphaned_docs]
     try:
-        vector_store_service.delete_document(document_id)
-        print("     ✅ 벡터 스토어에서 삭제 완료")
+        embeddings_deleted = await vector_store_service.adelete_documents(
+            orphan_ids
+        )
+        logger.info(
+            "   ✅ 벡터 스토어에서 임베딩 %s개 삭제 완료", embeddings_deleted
+        )
+        return True
     except Exception as e:
-        print(f"     ⚠️  벡터 스토어 삭제 오류: {e}")
+        logger.warning(
+            "   ⚠️  벡터 스토어 일괄 삭제 오류, 문서별로 재시도: %s", e
+        )
 
-    # DB에서 청크 삭제
-    chunks_deleted = (
-        db.query(DocumentChunk)
-        .filter(DocumentChunk.document_id == document_id)
-        .delete()
-    )
-    print(f"     ✅ 청크 {chunks_deleted}개 삭제 완료")
+    succeeded = True
+    for doc in orphaned_docs:
+        try:
+            await vector_store_service.adelete_documents([str(doc.id)])
+        except Exception as e:
+            succeeded = False
+            logger.warning(
+                "     ⚠️  벡터 스토어 삭제 오류 (%s): %s", doc.filename, e
+            )
+    return succeeded
 
-    # 문서 삭제
-    db.delete(doc)
-    print("     ✅ 문서 레코드 삭제 완료")
 
+def delete_db_documents(orphaned_docs) -> int:
+    """문서를 한 번의 DELETE로 삭제 (청크는 ON DELETE CASCADE로 함께 삭제)"""
+    orphan_ids = [doc.id for doc in orphaned_docs]
+    # 블록을 벗어나면 자동 커밋, 오류 시 자동 롤백 후 세션 반환
+    with SessionLocal() as db, db.begin():
+        return db.execute(
+            delete(Document).where(Document.id.in_(orphan_ids))
+        ).rowcount
 
-def execute_cleanup(db: Session, orphaned_docs):
-    """정리 실행"""
-    print(f"\n4. {len(orphaned_docs)}개 문서 정리 시작...")
-    cleaned_count = 0
 
-    for doc in orphaned_docs:
-        try:
-            delete_single_document(db, doc)
-            cleaned_count += 1
-        except Exception as e:
-            print(f"     ❌ 문서 정리 오류 ({doc.filename}): {e}")
-            continue
+async def _execute_cleanup(orphaned_docs) -> int:
+    """벡터 스토어 삭제와 DB 레코드 삭제를 동시에 진행"""
+    vectors_deleted, db_result = await asyncio.gather(
+        delete_vectors(orphaned_docs),
+        asyncio.to_thread(delete_db_documents, orphaned_docs),
+        return_exceptions=True,
+    )
+
+    if isinstance(db_result, BaseException):
+        logger.error("   ❌ 문서 정리 오류: %s", db_result)
+        if vectors_deleted is True:
+            # 한쪽만 삭제된 경우 다음 실행에서 다시 정리 대상으로 잡힘
+            logger.warning(
+                "   ⚠️  임베딩만 삭제되고 DB 문서는 남아 있습니다. "
+                "스크립트를 다시 실행하세요."
+            )
+        return 0
 
-    return cleaned_count
+    logger.info("   ✅ 문서 레코드 %s개 및 청크 삭제 완료", db_result)
+    if vectors_deleted is not True:
+        logger.warning(
+            "   ⚠️  일부 임베딩이 벡터 스토어에 남아 있을 수 있습니다."
+        )
+    return db_result
+
+
+def execute_cleanup(orphaned_docs):
+    """정리 실행"""
+    logger.info("\n4. %s개 문서 정리 시작...", len(orphaned_docs))
+    return asyncio.run(_execute_cleanup(orphaned_docs))
 
 
 def cleanup_orphaned_data():
     """MinIO에 없는 파일들의 DB 데이터 정리"""
     try:
-        db = SessionLocal()
-        print("=== MinIO-DB 동기화 정리 시작 ===")
+        logger.info("=== MinIO-DB 동기화 정리 시작 ===")
 
         # 1. MinIO 파일 목록 조회
         minio_pdf_files = get_minio_files()
         if minio_pdf_files is None:
             return False
 
-        # 2. DB 문서 목록 조회
-        db_documents = get_db_documents(db)
-        if not db_documents:
-            print("   - DB에 문서가 없습니다.")
-            db.close()
-            return True
+        # 정리 대상 조회는 짧은 세션에서 끝내고, 사용자 확인을 기다리는 동안
+        # 커넥션을 붙잡고 있지 않도록 바로 반환
+        with SessionLocal() as db:
+            # 2. DB 문서 수 조회
+            document_count = count_db_documents(db)
+            if not document_count:
+                logger.info("   - DB에 문서가 없습니다.")
+                return True
+
+            # 3. orphaned 문서 찾기
+            if minio_pdf_files:
+                orphaned_docs = find_orphaned_documents(db, minio_pdf_files)
+            else:
+                # MinIO가 비어 있으면 모든 문서가 정리 대상 (파일명 비교 생략)
+                logger.info(
+                    "\n3. MinIO에 PDF 파일이 없어 모든 DB 문서를 정리 대상으로 지정"
+                )
+                orphaned_docs = db.execute(
+                    select(Document.id, Document.filename).where(
+                        Document.status.is_distinct_from("processing")
+                    )
+                ).all()
 
-        # 3. orphaned 문서 찾기
-        orphaned_docs = find_orphaned_documents(db_documents, minio_pdf_files)
         if not orphaned_docs:
-            print(
+            logger.info(
                 "   ✅ 정리할 문서가 없습니다. DB와 MinIO가 동기화되어 있습니다."
             )
-            db.close()
             return True
 
         # 4. 요약 출력
-        print("\n📊 정리 요약:")
-        print(f"   - MinIO 파일: {len(minio_pdf_files)}개")
-        print(f"   - DB 문서: {len(db_documents)}개")
-        print(f"   - 정리 대상: {len(orphaned_docs)}개")
+        logger.info("\n📊 정리 요약:")
+        logger.info("   - MinIO 파일: %s개", len(minio_pdf_files))
+        logger.info("   - DB 문서: %s개", document_count)
+        logger.info("   - 정리 대상: %s개", len(orphaned_docs))
 
         # 5. 사용자 확인
         if not confirm_cleanup(orphaned_docs):
-            print("   정리 작업이 취소되었습니다.")
-            db.close()
+            logger.info("   정리 작업이 취소되었습니다.")
             return False
 
-        # 6. 정리 실행
-        cleaned_count = execute_cleanup(db, orphaned_docs)
-
-        # 7. 커밋 및 결과 출력
-        db.commit()
-        db.close()
+        # 6. 정리 실행 (확인 후 새 세션에서 커밋까지 수행)
+        cleaned_count = execute_cleanup(orphaned_docs)
 
-        print("\n🎉 정리 완료!")
-        print(f"   - 정리된 문서: {cleaned_count}개")
-        print(f"   - 실패한 문서: {len(orphaned_docs) - cleaned_count}개")
+        # 7. 결과 출력
+        logger.info("\n🎉 정리 완료!")
+        logger.info("   - 정리된 문서: %s개", cleaned_count)
+        logger.info(
+            "   - 실패한 문서: %s개", len(orphaned_docs) - cleaned_count
+        )
 
         return True
 
     except Exception as e:
-        print(f"❌ 정리 스크립트 오류: {e}")
-        if "db" in locals():
-            db.rollback()
-            db.close()
+        logger.error("❌ 정리 스크립트 오류: %s", e)
         return False
 
 
 def show_current_status():
     """현재 상태만 보여주기"""
     try:
-        db = SessionLocal()
-
-        print("=== 현재 MinIO-DB 상태 ===")
+        logger.info("=== 현재 MinIO-DB 상태 ===")
 
         # MinIO 파일 목록
         try:
-            minio_files = storage_service.list_files()
-            minio_pdf_files = [f for f in minio_files if f.endswith(".pdf")]
-            print(f"\n📁 MinIO 파일: {len(minio_pdf_files)}개")
-            for file in minio_pdf_files:
-                print(f"   - {file}")
+            minio_pdf_files = list_minio_pdf_files()
+            logger.info("\n📁 MinIO 파일: %s개", len(minio_pdf_files))
+            if logger.isEnabledFor(logging.DEBUG):
+                for file in minio_pdf_files:
+                    logger.debug("   - %s", file)
         except Exception as e:
-            print(f"❌ MinIO 연결 오류: {e}")
-
-        # DB 문서 목록
-        db_documents = db.query(Document).all()
-        print(f"\n🗄️  DB 문서: {len(db_documents)}개")
-        for doc in db_documents:
-            chunks_count = (
-                db.query(DocumentChunk)
-                .filter(DocumentChunk.document_id == doc.id)
-                .count()
-            )
-            print(f"   - {doc.filename} (청크: {chunks_count}개)")
+            logger.error("❌ MinIO 연결 오류: %s", e)
 
-        db.close()
+        with SessionLocal() as db:
+            # DB 문서 수 (전체 행을 불러오지 않고 COUNT로 집계)
+            document_count = db.scalar(
+                select(func.count()).select_from(Document)
+            )
+            logger.info("\n🗄️  DB 문서: %s개", document_count)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                # 문서별 청크 수를 한 번의 GROUP BY 쿼리로 집계하고,
+                # 결과는 1000행씩 나누어 받아 메모리 사용량을 일정하게 유지
+                db_documents = db.execute(
+                    select(Document.filename, func.count(DocumentChunk.id))
+                    .outerjoin(
+                        DocumentChunk,
+                        DocumentChunk.document_id == Document.id,
+                    )
+                    .group_by(Document.id)
+                    .execution_options(yield_per=1000)
+                )
+                for filename, chunks_count in db_documents:
+                    logger.debug("   - %s (청크: %s개)", filename, chunks_count)
 
     except Exception as e:
-        print(f"❌ 상태 조회 오류: {e}")
+        logger.error("❌ 상태 조회 오류: %s", e)
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MinIO-DB 동기화 정리 도구")
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="파일/문서 목록을 하나씩 출력",
+    )
+    args = parser.parse_args()
+
+    # 진행 상황은 로거로 출력하고, 파일/문서별 목록은 DEBUG 레벨로 분리
+    # (--verbose가 없으면 목록 메시지는 포맷팅 자체를 하지 않음)
+    logging.basicConfig(
+        level=logging.INFO, format="%(message)s", stream=sys.stdout
+    )
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
     print("=== MinIO-DB 동기화 정리 도구 ===")
-    print("\n옵션:")
-    print("1. 현재 상태만 확인")
-    print("2. orphaned 데이터 정리")
-
-    choice = input("\n선택하세요 (1/2): ").strip()
-
-    if choice == "1":
-        show_current_status()
-    elif choice == "2":
-        cleanup_orphaned_data()
-    else:
-        print("잘못된 선택입니다.")
+
+    # 상태 확인 후 바로 정리할 수 있도록 종료할 때까지 메뉴 반복
+    # (MinIO 목록은 MINIO_LIST_TTL초 동안 재사용)
+    while True:
+        print("\n옵션:")
+        print("1. 현재 상태만 확인")
+        print("2. orphaned 데이터 정리")
+        print("q. 종료")
+
+        choice = input("\n선택하세요 (1/2/q): ").strip().lower()
+
+        if choice == "1":
+            show_current_status()
+        elif choice == "2":
+            cleanup_orphaned_data()
+        elif choice in ("q", ""):
+            break
+        else:
+            print("잘못된 선택입니다.")
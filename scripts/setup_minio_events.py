@@ -3,23 +3,35 @@
 MinIO Event Notification 설정 스크립트
 """
 
+import asyncio
 import json
-import time
+import os
 
+import httpx
 import requests
+import urllib3
 from minio import Minio
 from minio.commonconfig import ENABLED
+from minio.error import S3Error
 from minio.notificationconfig import NotificationConfig, WebhookConfig
 
 
 def setup_minio_events():
     """MinIO Event Notification 설정"""
-    # MinIO 클라이언트 설정
+    # MinIO 클라이언트 설정 (요청 몇 개뿐이므로 작은 커넥션 풀 하나를 재사용)
     client = Minio(
         "localhost:9000",
         access_key="minioadmin",
         secret_key="minioadmin",
         secure=False,
+        http_client=urllib3.PoolManager(
+            maxsize=4,
+            retries=urllib3.Retry(
+                total=5,
+                backoff_factor=0.2,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        ),
     )
 
     bucket_name = "pdf-documents"
@@ -28,13 +40,6 @@ def setup_minio_events():
     try:
         print("MinIO Event Notification 설정 시작...")
 
-        # 버킷이 존재하는지 확인
-        if not client.bucket_exists(bucket_name):
-            print(
-                f"버킷 '{bucket_name}'이 존재하지 않습니다. 먼저 버킷을 생성하세요."
-            )
-            return False
-
         # 웹훅 설정 - 생성 및 삭제 이벤트 모두 처리
         webhook_config = WebhookConfig(
             "pdf_processor",  # 웹훅 ID
@@ -48,18 +53,27 @@ def setup_minio_events():
             webhook_config_list=[webhook_config]
         )
 
-        # 버킷에 notification 설정 적용
-        client.set_bucket_notification(bucket_name, notification_config)
+        # 버킷에 notification 설정 적용 (버킷 존재 여부는 오류 코드로 확인)
+        try:
+            client.set_bucket_notification(bucket_name, notification_config)
+        except S3Error as e:
+            if e.code == "NoSuchBucket":
+                print(
+                    f"버킷 '{bucket_name}'이 존재하지 않습니다. 먼저 버킷을 생성하세요."
+                )
+                return False
+            raise
 
         print(f"✅ 버킷 '{bucket_name}'에 Event Notification 설정 완료")
         print(f"   웹훅 URL: {webhook_url}")
         print("   이벤트: s3:ObjectCreated:*, s3:ObjectRemoved:*")
 
-        # 설정 확인
-        config = client.get_bucket_notification(bucket_name)
-        print(
-            f"✅ 설정 확인 완료: {len(config.webhook_config_list)}개 웹훅 설정됨"
-        )
+        # 설정 확인 (VERBOSE_SETUP 지정 시에만 추가 조회)
+        if os.environ.get("VERBOSE_SETUP"):
+            config = client.get_bucket_notification(bucket_name)
+            print(
+                f"✅ 설정 확인 완료: {len(config.webhook_config_list)}개 웹훅 설정됨"
+            )
 
         return True
 
@@ -104,39 +118,49 @@ def test_webhook_endpoint():
         return False
 
 
-def wait_for_services():
-    """서비스들이 준비될 때까지 대기"""
-    print("서비스 준비 상태 확인 중...")
-
-    # MinIO 대기
-    for i in range(30):
+async def _probe(
+    client: httpx.AsyncClient, name: str, url: str, deadline: float
+) -> bool:
+    """준비될 때까지 지수 백오프(0.1초부터 최대 2초)로 헬스 체크 반복"""
+    loop = asyncio.get_running_loop()
+    attempt = 0
+    while True:
         try:
-            response = requests.get(
-                "http://localhost:9000/minio/health/live", timeout=5
-            )
+            response = await client.get(url, timeout=2)
             if response.status_code == 200:
-                print("✅ MinIO 준비 완료")
-                break
-        except Exception:
-            if i == 29:
-                print("❌ MinIO 연결 실패")
-                return False
-            time.sleep(2)
+                print(f"✅ {name} 준비 완료")
+                return True
+        except httpx.HTTPError:
+            pass
+
+        delay = min(2.0, 0.1 * 2**attempt)
+        if loop.time() + delay > deadline:
+            print(f"❌ {name} 연결 실패")
+            return False
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _wait_for_services(timeout: float) -> bool:
+    """MinIO와 FastAPI를 동시에 확인"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    async with httpx.AsyncClient() as client:
+        results = await asyncio.gather(
+            _probe(
+                client,
+                "MinIO",
+                "http://localhost:9000/minio/health/live",
+                deadline,
+            ),
+            _probe(client, "FastAPI", "http://localhost:8000/health", deadline),
+        )
+    return all(results)
 
-    # FastAPI 대기
-    for i in range(30):
-        try:
-            response = requests.get("http://localhost:8000/health", timeout=5)
-            if response.status_code == 200:
-                print("✅ FastAPI 준비 완료")
-                break
-        except Exception:
-            if i == 29:
-                print("❌ FastAPI 연결 실패")
-                return False
-            time.sleep(2)
 
-    return True
+def wait_for_services(timeout: float = 60) -> bool:
+    """서비스들이 준비될 때까지 대기"""
+    print("서비스 준비 상태 확인 중...")
+    return asyncio.run(_wait_for_services(timeout))
 
 
 if __name__ == "__main__":